@@ -1,5 +1,10 @@
 import streamlit as st
 
+from SIP.finance.metrics import mark_startup, start_exporter
+from SIP.finance.warmup import start_warmup
+
+mark_startup("landing", "imports")
+
 # 1. Page Configuration
 st.set_page_config(
     page_title="ArthaFlow | Personal Finance Hub",
@@ -7,6 +12,11 @@ st.set_page_config(
     layout="centered"
 )
 
+# Load market data in the background (once per process) so the SIP Planner opens without waiting on MFAPI.in
+start_warmup()
+# Writes the Prometheus metrics file when ARTHAFLOW_METRICS and ARTHAFLOW_METRICS_FILE are set
+start_exporter()
+
 # 2. Custom CSS for Fintech Look & Dark Blue Hover
 st.markdown("""
     <style>
@@ -89,4 +99,6 @@ with st.expander("ℹ️ About ArthaFlow"):
         our tools provide data-driven insights to help you make better decisions.
     """)
 
-st.caption("© 2025 ArthaFlow | Built for Financial Clarity")
\ No newline at end of file
+st.caption("© 2025 ArthaFlow | Built for Financial Clarity")
+
+mark_startup("landing", "first_paint")
@@ -0,0 +1,5 @@
+import time
+
+# Reference point for the startup timings in metrics: when a page first imports the package.
+# Keep this module free of heavy imports; engines are imported by module (SIP.finance.portfolio, ...).
+IMPORTED_AT = time.perf_counter()
@@ -0,0 +1,227 @@
+import numpy as np
+
+from .data_fetcher import scheme_code
+from .nav_series import EPOCH_ORDINAL, NavSeries
+from .nav_store import default_store
+
+XIRR_DAYS = 365.0
+
+
+def solve_xirr(outflows, years_held, terminal_value, tol=1e-10, max_iter=50):
+    """
+    Vectorized XIRR for SIP cash flows: finds r per row such that
+    sum(outflows * (1 + r) ** years_held) == terminal_value.
+
+    outflows: (..., flows) instalment amounts (positive)
+    years_held: (..., flows) years from each instalment to the valuation date
+    terminal_value: (...) value of the holding on the valuation date
+
+    Newton's method on x = ln(1 + r). The residual is concave and decreasing
+    in x, so after the first step every iterate approaches the root from
+    above without overshooting. Rows without a solution come back as NaN.
+    Returns the XIRR in percent.
+    """
+    outflows = np.asarray(outflows, dtype=float)
+    years_held = np.asarray(years_held, dtype=float)
+    terminal_value = np.asarray(terminal_value, dtype=float)
+    outflows, years_held = np.broadcast_arrays(outflows, years_held)
+    batch_shape = np.broadcast_shapes(outflows.shape[:-1], terminal_value.shape)
+    outflows = np.broadcast_to(outflows, batch_shape + outflows.shape[-1:]).reshape(-1, outflows.shape[-1])
+    years_held = np.broadcast_to(years_held, outflows.shape[:-1] + years_held.shape[-1:]).reshape(outflows.shape)
+    value = np.broadcast_to(terminal_value, batch_shape).reshape(-1)
+
+    invested = outflows.sum(axis=-1)
+    # Start from the money-weighted holding period: exact for a single flow
+    duration = (outflows * years_held).sum(axis=-1) / invested
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(value / invested) / duration
+    x = np.where(np.isfinite(x), x, np.nan)
+
+    active = np.flatnonzero(np.isfinite(x))
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        grown = outflows[active] * np.exp(x[active, None] * years_held[active])
+        residual = grown.sum(axis=-1) - value[active]
+        slope = (grown * years_held[active]).sum(axis=-1)
+        step = residual / slope
+        x[active] -= step
+        active = active[np.abs(step) > tol]
+    return ((np.exp(x) - 1) * 100).reshape(batch_shape)
+
+
+class _InstalmentGrid:
+    """
+    Executed transaction date and units bought per rupee for every instalment
+    slot of a NAV history: one row per day of month (1-31), one column per
+    calendar month. An instalment due on a holiday executes at the next
+    published NAV; a due day past the month's end moves to the last day.
+    """
+
+    def __init__(self, series):
+        self.series = series
+        dates, navs = series.dates, series.navs
+        first_month = (dates[0] - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        last_month = (dates[-1] - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        month_starts = np.arange(first_month, last_month + 2)
+        month_lengths = np.diff(month_starts.astype("datetime64[D]")).astype(np.int64)
+
+        self.first_month = first_month.astype(np.int64)
+        day = np.arange(1, 32)[:, None]
+        self.due = (month_starts[:-1].astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+                    + np.minimum(day, month_lengths) - 1)
+        index = np.searchsorted(dates, self.due, side="left")
+        executed = index < len(dates)
+        index = np.minimum(index, len(dates) - 1)
+        self.executed = np.where(executed, dates[index], np.iinfo(np.int64).max)
+        # Units per rupee, cumulated along the months (leading zero column)
+        units = np.where(executed, 1 / navs[index], np.nan)
+        self.cum_units = np.concatenate([np.zeros((31, 1)), np.cumsum(units, axis=1)], axis=1)
+
+    def slots(self, starts):
+        """
+        (day-of-month row, first month column) for start ordinals.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        days = (starts - EPOCH_ORDINAL).astype("datetime64[D]")
+        rows = (days - days.astype("datetime64[M]")).astype(np.int64)
+        cols = days.astype("datetime64[M]").astype(np.int64) - self.first_month
+        return rows, cols
+
+    def valid_starts(self, starts, months):
+        """
+        Mask of starts whose whole SIP, including the valuation date
+        `months` after the start, lies inside the history.
+        """
+        rows, cols = self.slots(starts)
+        end_cols = cols + months
+        inside = (np.asarray(starts) >= self.series.dates[0]) & (cols >= 0) & (end_cols < self.due.shape[1])
+        end_cols = np.where(inside, end_cols, 0)
+        return inside & (self.due[rows, end_cols] <= self.series.dates[-1])
+
+
+class BacktestResult:
+    """
+    Historical SIP outcomes, one entry per start date.
+    `start_dates` are date ordinals; `xirr` is in percent.
+    """
+
+    __slots__ = ("start_dates", "corpus", "total_invested", "xirr")
+
+    def __init__(self, start_dates, corpus, total_invested, xirr):
+        self.start_dates = start_dates
+        self.corpus = corpus
+        self.total_invested = total_invested
+        self.xirr = xirr
+
+    def __len__(self):
+        return len(self.start_dates)
+
+    @property
+    def start_datetimes(self):
+        return (self.start_dates - EPOCH_ORDINAL).astype("datetime64[D]")
+
+    def percentiles(self, field="xirr", percentiles=(10, 50, 90)):
+        return np.nanpercentile(getattr(self, field), percentiles)
+
+
+class _FundBacktest:
+    """
+    Per-fund arrays for a set of start dates, kept so a portfolio can merge
+    its funds' cash flows for one combined XIRR.
+    """
+
+    def __init__(self, grid, starts, initial_sip, years, step_up_pct):
+        months = years * 12
+        rows, cols = grid.slots(starts)
+        yearly_sip = initial_sip * (1 + step_up_pct / 100) ** np.arange(years)
+
+        # Units bought in each year of the SIP are differences of the cumulative
+        # units-per-rupee curve, so no start date needs its own loop
+        year_cols = cols[:, None] + 12 * np.arange(years + 1)
+        units = np.diff(grid.cum_units[rows[:, None], year_cols], axis=1) @ yearly_sip
+
+        valuation_dates = grid.due[rows, cols + months]
+        nav_index = np.searchsorted(grid.series.dates, valuation_dates, side="right") - 1
+        self.corpus = units * grid.series.navs[nav_index]
+        self.amounts = np.repeat(yearly_sip, 12)
+        executed = grid.executed[rows[:, None], cols[:, None] + np.arange(months)]
+        self.years_held = (valuation_dates[:, None] - executed) / XIRR_DAYS
+        self.total_invested = float(self.amounts.sum())
+
+    def result(self, starts):
+        xirr = solve_xirr(self.amounts, self.years_held, self.corpus)
+        return BacktestResult(starts, self.corpus, self.total_invested, xirr)
+
+
+def _start_dates(grids, months, starts=None):
+    """
+    Candidate starts (default: every day all funds published a NAV) that
+    leave a full SIP horizon of history in every fund.
+    """
+    if starts is None:
+        starts = grids[0].series.dates
+        for grid in grids[1:]:
+            starts = np.intersect1d(starts, grid.series.dates)
+    starts = np.asarray(starts, dtype=np.int64)
+    for grid in grids:
+        starts = starts[grid.valid_starts(starts, months)]
+    return starts
+
+
+def backtest_sip(series, initial_sip, years, step_up_pct, starts=None):
+    """
+    Replays a step-up SIP (as in calculate_fund_growth: monthly instalments,
+    stepped up every 12 months) against real NAVs for every start date at once.
+
+    Each instalment buys units at the NAV of its actual transaction date and
+    the holding is valued `years` later at the NAV published on or before
+    that day. starts: date ordinals to test (default: every NAV date with a
+    full horizon of history after it).
+    """
+    grid = _InstalmentGrid(series)
+    starts = _start_dates([grid], years * 12, starts)
+    return _FundBacktest(grid, starts, initial_sip, years, step_up_pct).result(starts)
+
+
+class PortfolioBacktest:
+    """
+    Backtest of several funds started on the same dates: per-fund results
+    plus the combined corpus and the XIRR of all the portfolio's cash flows.
+    """
+
+    __slots__ = ("combined", "funds")
+
+    def __init__(self, combined, funds):
+        self.combined = combined
+        self.funds = funds
+
+
+def backtest_portfolio(series_list, fund_sips, years, step_up_pct, names=None, starts=None):
+    """
+    Backtests one SIP per fund over the start dates shared by every fund.
+    """
+    grids = [_InstalmentGrid(series) for series in series_list]
+    starts = _start_dates(grids, years * 12, starts)
+    runs = [_FundBacktest(grid, starts, sip, years, step_up_pct) for grid, sip in zip(grids, fund_sips)]
+
+    corpus = sum(run.corpus for run in runs)
+    if all(np.array_equal(run.years_held, runs[0].years_held) for run in runs[1:]):
+        # Funds on the same trading calendar transact together: one flow per date
+        amounts, years_held = sum(run.amounts for run in runs), runs[0].years_held
+    else:
+        amounts = np.concatenate([np.broadcast_to(run.amounts, run.years_held.shape) for run in runs], axis=1)
+        years_held = np.concatenate([run.years_held for run in runs], axis=1)
+    combined = BacktestResult(starts, corpus, sum(run.total_invested for run in runs),
+                              solve_xirr(amounts, years_held, corpus))
+    names = names or [series.code for series in series_list]
+    return PortfolioBacktest(combined, {name: run.result(starts) for name, run in zip(names, runs)})
+
+
+def backtest_categories(categories, fund_sips, years, step_up_pct):
+    """
+    Portfolio backtest for SCHEME_MAP categories or scheme codes, from the NAV store.
+    """
+    store = default_store()
+    series_list = [NavSeries.from_history(store.get(scheme_code(cat))) for cat in categories]
+    return backtest_portfolio(series_list, fund_sips, years, step_up_pct, names=list(categories))
@@ -0,0 +1,285 @@
+"""
+Headless batch planner for a whole client book.
+
+    python -m SIP.finance.batch clients.csv results.csv
+    python -m SIP.finance.batch book.parquet results.parquet --workers 8
+    python -m SIP.finance.batch clients.csv results.csv --offline --snapshot returns.json
+
+Input columns (one row per client plan):
+    client_id, monthly_sip, years, step_up_pct
+    one allocation % column per category: Debt MF, Gold ETF, Nifty 50, Flexi Cap, Mid Cap, Small Cap
+    optional loan step-up plan: loan_balance, loan_rate, loan_emi, loan_contribution,
+    loan_step_up_pct, loan_split_ratio, loan_sip_return
+
+Plans are read and written chunk by chunk, so memory stays bounded by
+--chunk-size x (--workers x 2) rows however large the book is. Parquet needs
+pyarrow.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data_fetcher import FALLBACK_RETURNS, SCHEME_MAP, fetch_real_returns, lookback_years
+from .loan_engine import first_month, stepup_curves
+from .sip_engine import fund_terminal_value
+
+CATEGORIES = list(SCHEME_MAP)
+LOOKBACKS = (1, 3, 5)
+# Tenure that selects each lookback in fetch_real_return
+_TENURE_FOR_LOOKBACK = {1: 1, 3: 5, 5: 10}
+
+LOAN_COLUMNS = ("loan_balance", "loan_rate", "loan_emi", "loan_contribution",
+                "loan_step_up_pct", "loan_split_ratio", "loan_sip_return")
+LOAN_DEFAULTS = {"loan_step_up_pct": 0.0, "loan_split_ratio": 50.0, "loan_sip_return": 12.0}
+
+
+# --- RETURNS SNAPSHOT ---
+def build_snapshot(offline=False):
+    """
+    One CAGR per (category, lookback), shared by every plan in the run.
+    Live returns are fetched once per lookback through the NAV store;
+    offline uses the static fallback table.
+    """
+    returns = {cat: {} for cat in CATEGORIES}
+    for lookback in LOOKBACKS:
+        if offline:
+            live = {cat: (FALLBACK_RETURNS[cat], lookback) for cat in CATEGORIES}
+        else:
+            live = fetch_real_returns(CATEGORIES, _TENURE_FOR_LOOKBACK[lookback])
+        for cat in CATEGORIES:
+            returns[cat][str(lookback)] = live[cat][0]
+    return {"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "offline": offline, "returns": returns}
+
+
+def load_snapshot(path, offline=False):
+    """
+    Reads a snapshot JSON, or builds one and saves it there, so reruns of
+    the same book use identical returns.
+    """
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    snapshot = build_snapshot(offline)
+    if path:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh, indent=2)
+    return snapshot
+
+
+def _return_table(snapshot):
+    # (lookbacks, categories) matrix in LOOKBACKS / CATEGORIES order
+    return np.array([[snapshot["returns"][cat][str(lb)] for cat in CATEGORIES] for lb in LOOKBACKS])
+
+
+# --- PLANNING ---
+def _column(chunk, name, default=np.nan):
+    if name in chunk:
+        return pd.to_numeric(chunk[name], errors="coerce").to_numpy(dtype=float)
+    return np.full(len(chunk), default)
+
+
+def plan_chunk(chunk, snapshot):
+    """
+    Evaluates a DataFrame of client plans in vectorized passes and returns
+    one result row per plan. Invalid plans get a status message and NaNs.
+    """
+    sip = _column(chunk, "monthly_sip")
+    years = _column(chunk, "years")
+    step_up = np.nan_to_num(_column(chunk, "step_up_pct", 0.0))
+    allocations = np.column_stack([np.nan_to_num(_column(chunk, cat, 0.0)) for cat in CATEGORIES])
+
+    total_alloc = allocations.sum(axis=1)
+    status = np.where(~(np.abs(total_alloc - 100) < 1e-6),
+                      "Total allocation must be 100%",
+                      np.where(~((sip > 0) & (years >= 1)), "SIP amount and tenure must be greater than 0.", "ok"))
+    valid = status == "ok"
+
+    out = pd.DataFrame({"client_id": chunk["client_id"] if "client_id" in chunk else chunk.index}, index=chunk.index)
+    corpus = np.full(len(chunk), np.nan)
+    invested = np.full(len(chunk), np.nan)
+    if valid.any():
+        whole_years = np.round(years[valid]).astype(int)
+        lookback_row = np.searchsorted(LOOKBACKS, [lookback_years(y) for y in whole_years.tolist()])
+        returns = _return_table(snapshot)[lookback_row]                     # (plans, funds)
+        fund_sips = sip[valid, None] * allocations[valid] / 100
+        fund_corpus, fund_invested = fund_terminal_value(
+            fund_sips, whole_years[:, None], step_up[valid, None], returns
+        )
+        corpus[valid] = fund_corpus.sum(axis=1)
+        invested[valid] = np.broadcast_to(fund_invested, fund_corpus.shape).sum(axis=1)
+
+    out["status"] = status
+    out["final_corpus"] = corpus.round(2)
+    out["total_invested"] = invested.round(2)
+    out["wealth_gain"] = (corpus - invested).round(2)
+    out["multiplier"] = (corpus / invested).round(4)
+
+    if "loan_balance" in chunk:
+        out = out.join(_plan_loans(chunk))
+    return out
+
+
+def _plan_loans(chunk):
+    """
+    Loan step-up outcomes for the rows that carry a loan, in one array pass.
+    """
+    params = {name: _column(chunk, name, LOAN_DEFAULTS.get(name, np.nan)) for name in LOAN_COLUMNS}
+    for name, default in LOAN_DEFAULTS.items():
+        params[name] = np.where(np.isnan(params[name]), default, params[name])
+    has_loan = np.all([~np.isnan(params[name]) for name in LOAN_COLUMNS], axis=0) & (params["loan_balance"] > 0)
+
+    freedom = np.zeros(len(chunk), dtype=int)
+    payoff = np.zeros(len(chunk), dtype=int)
+    net_worth = np.full(len(chunk), np.nan)
+    if has_loan.any():
+        _, loan, sip, payoff_month = stepup_curves(*(params[name][has_loan] for name in LOAN_COLUMNS))
+        freedom[has_loan] = first_month((sip >= loan) & (loan > 0))
+        payoff[has_loan] = payoff_month
+        net_worth[has_loan] = sip[:, -1] - loan[:, -1]
+
+    # 0: does not happen within the horizon; -1: the plan has no loan
+    return pd.DataFrame({
+        "loan_freedom_month": np.where(has_loan, freedom, -1),
+        "loan_payoff_month": np.where(has_loan, payoff, -1),
+        "loan_net_worth": net_worth.round(2),
+    }, index=chunk.index)
+
+
+# --- I/O ---
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet input/output needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def read_plans(path, chunk_size):
+    """
+    Yields DataFrames of at most `chunk_size` plans without loading the whole file.
+    """
+    if _is_parquet(path):
+        pa = _pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ResultWriter:
+    """
+    Appends result chunks to CSV or Parquet as they arrive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def write(self, frame):
+        if _is_parquet(self.path):
+            pa = _pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def __exit__(self, *exc):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+# --- PARALLEL DRIVER ---
+_worker_snapshot = None
+
+
+def _init_worker(snapshot):
+    # Each worker receives the snapshot once instead of with every chunk
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+
+def _plan_in_worker(chunk):
+    return plan_chunk(chunk, _worker_snapshot)
+
+
+def _bounded_map(pool, fn, items, max_pending):
+    """
+    Ordered pool.map that keeps at most `max_pending` chunks in flight, so
+    a large input is never read into memory ahead of the writers.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_batch(input_path, output_path, snapshot, workers=None, chunk_size=2000, progress=None):
+    """
+    Plans every client in `input_path` and writes the results to
+    `output_path`. Returns the number of plans written.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = read_plans(input_path, chunk_size)
+    with ResultWriter(output_path) as writer:
+        if workers == 1:
+            results = (plan_chunk(chunk, snapshot) for chunk in chunks)
+            for frame in results:
+                writer.write(frame)
+                if progress:
+                    progress(writer.rows)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(snapshot,)) as pool:
+                for frame in _bounded_map(pool, _plan_in_worker, chunks, workers * 2):
+                    writer.write(frame)
+                    if progress:
+                        progress(writer.rows)
+        return writer.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m SIP.finance.batch", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="client plans (.csv or .parquet)")
+    parser.add_argument("output", help="results file (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="plans per work unit (default 2000)")
+    parser.add_argument("--snapshot", help="returns snapshot JSON to reuse, or to create if missing")
+    parser.add_argument("--offline", action="store_true", help="use the static fallback returns, no network")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    snapshot = load_snapshot(args.snapshot, args.offline)
+    total = run_batch(
+        args.input, args.output, snapshot, args.workers, args.chunk_size,
+        progress=lambda rows: print(f"\r{rows:,} plans", end="", file=sys.stderr, flush=True),
+    )
+    elapsed = time.perf_counter() - started
+    print(f"\r{total:,} plans written to {args.output} in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the host's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+    Opens after `failure_threshold` consecutive failures so callers can answer
+    from cached data straight away. While open, at most one background probe
+    runs every `reset_timeout` seconds; a successful probe closes the circuit.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.state == OPEN
+
+    def allow_request(self):
+        return self.state == CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def probe_in_background(self, probe):
+        """
+        Starts `probe()` on a daemon thread if the circuit is open, the reset
+        timeout has passed and no other probe is running. Never blocks.
+        """
+        with self._lock:
+            due = time.monotonic() - self.opened_at >= self.reset_timeout
+            if self.state != OPEN or self._probing or not due:
+                return False
+            self._probing = True
+
+        def run():
+            try:
+                probe()
+                self.record_success()
+            except Exception:
+                self.record_failure()
+            finally:
+                self._probing = False
+
+        threading.Thread(target=run, name=f"probe-{self.name}", daemon=True).start()
+        return True
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def breaker_for(url, **kwargs):
+    """
+    Returns the shared breaker for the host of `url`, creating it on first use.
+    """
+    host = urlparse(url).netloc or url
+    with _registry_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host, **kwargs)
+        return _breakers[host]
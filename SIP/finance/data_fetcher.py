@@ -1,5 +1,8 @@
-import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import increment, timed
+from .nav_series import NavSeries, ROLLING_WINDOWS
+from .nav_store import default_store
 
 # Updated to funds with longer historical footprints (Direct/Growth)
 SCHEME_MAP = {
@@ -11,33 +14,55 @@ SCHEME_MAP = {
     "Small Cap": "125497"   # Nippon India Small Cap
 }
 
-def fetch_real_return(category, tenure_years):
+FALLBACK_RETURNS = {"Debt MF": 7.0, "Gold ETF": 9.5, "Nifty 50": 12.5, "Flexi Cap": 14.5, "Mid Cap": 17.0, "Small Cap": 19.0}
+
+# Last good answer per (category, lookback) and the categories currently not served live
+_last_good = {}
+_degraded = {}
+
+def degraded_categories():
+    """
+    Categories whose latest answer was not live.
+    Maps category -> "stale" (last known good / stored NAVs) or "fallback" (static table).
+    """
+    return dict(_degraded)
+
+def scheme_code(fund):
+    """
+    mfapi.in scheme code for a SCHEME_MAP category, or `fund` itself when it
+    is already a scheme code (e.g. a fund picked from the scheme index).
+    """
+    code = str(SCHEME_MAP.get(fund, fund))
+    if not code.isdigit():
+        raise KeyError(f"Unknown fund category or scheme code: {fund!r}")
+    return code
+
+def lookback_years(tenure_years):
     # Determine desired lookback (Caps at 5Y to avoid data gaps in some APIs)
-    desired_lookback = 1 if tenure_years < 5 else (3 if tenure_years < 10 else 5)
+    return 1 if tenure_years < 5 else (3 if tenure_years < 10 else 5)
+
+@timed("fetch_real_return")
+def fetch_real_return(category, tenure_years):
+    """
+    Annualized return over the lookback for `tenure_years`, as (pct, years).
+    `category` is a SCHEME_MAP category or any mfapi.in scheme code; the
+    sanity guards only apply to the built-in categories.
+    """
+    desired_lookback = lookback_years(tenure_years)
 
     try:
-        code = SCHEME_MAP.get(category)
-        response = requests.get(f"https://api.mfapi.in/mf/{code}", timeout=10).json()
-        nav_data = response['data']
-        
-        latest_nav = float(nav_data[0]['nav'])
-        
-        # Smart Indexing: Don't overshoot available data
-        days_available = len(nav_data)
-        target_index = min(desired_lookback * 250, days_available - 1)
-        old_nav = float(nav_data[target_index]['nav'])
-        
-        # Calculate ACTUAL years between dates provided by API
-        date_format = "%d-%m-%Y"
-        d_latest = datetime.strptime(nav_data[0]['date'], date_format)
-        d_old = datetime.strptime(nav_data[target_index]['date'], date_format)
-        actual_years = (d_latest - d_old).days / 365.25
+        code = scheme_code(category)
+        # Served from the local NAV store; only new days are pulled from mfapi.in
+        store = default_store()
+        history = store.get(code)
+        series = NavSeries.from_history(history)
+
+        # Lookback by calendar date on the date index; starts at the first NAV
+        # when the fund is younger than the window
+        annualized_return, actual_years = series.cagr(desired_lookback)
         
         if actual_years <= 0: return 12.0, 0
         
-        # CAGR calculation
-        annualized_return = (pow(latest_nav / old_nav, 1/actual_years) - 1) * 100
-        
         # --- Financial Expert Sanity Guard ---
         # Prevents outliers from breaking long-term projections
         if category == "Debt MF":
@@ -45,8 +70,49 @@ def fetch_real_return(category, tenure_years):
         if category == "Gold ETF":
             annualized_return = max(4.0, annualized_return) # Gold rarely negative over 5Y
             
-        return round(annualized_return, 2), round(actual_years)
+        result = round(annualized_return, 2), round(actual_years)
+        _last_good[(category, desired_lookback)] = result
+        if store.is_stale(history):
+            _degraded[category] = "stale"
+        else:
+            _degraded.pop(category, None)
+        increment("fetch_real_return_total", outcome=_degraded.get(category, "live"))
+        return result
     
     except Exception:
-        fallbacks = {"Debt MF": 7.0, "Gold ETF": 9.5, "Nifty 50": 12.5, "Flexi Cap": 14.5, "Mid Cap": 17.0, "Small Cap": 19.0}
-        return fallbacks.get(category, 12.0), desired_lookback
\ No newline at end of file
+        # Answer instantly from the last good value, else the static table
+        if (category, desired_lookback) in _last_good:
+            _degraded[category] = "stale"
+            increment("fetch_real_return_total", outcome="stale")
+            return _last_good[(category, desired_lookback)]
+        _degraded[category] = "fallback"
+        increment("fetch_real_return_total", outcome="fallback")
+        return FALLBACK_RETURNS.get(category, 12.0), desired_lookback
+
+def fetch_rolling_returns(category, windows=ROLLING_WINDOWS):
+    """
+    Rolling CAGR for every start date in the stored NAV history.
+    Returns {window_years: (start_ordinals, cagr_pct)}; empty when no
+    history is available for the category.
+    """
+    try:
+        history = default_store().get(scheme_code(category))
+    except Exception:
+        return {}
+    return NavSeries.from_history(history).rolling_cagrs(windows)
+
+def fetch_real_returns(categories, tenure_years, max_workers=None):
+    """
+    Fetches returns for several categories at once.
+    Schemes are pulled concurrently over the store's pooled session, so the
+    wall time matches the slowest scheme rather than the sum of all of them.
+    Returns {category: (annualized_return, years_used)}.
+    """
+    categories = list(dict.fromkeys(categories))
+    if not categories:
+        return {}
+
+    workers = max_workers or len(categories)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda cat: fetch_real_return(cat, tenure_years), categories)
+        return dict(zip(categories, results))
@@ -0,0 +1,87 @@
+import numpy as np
+
+# Points sent to the browser per chart, shared by all of its series. Small
+# enough that a 20-year monthly loan chart (2 x 240 points) is downsampled.
+MAX_CHART_POINTS = 160
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that preserve
+    the visual shape of (x, y). The first and last points are always kept.
+    Each bucket keeps the point forming the largest triangle with the point
+    kept before it and the average of the next bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 1)]
+
+    # Interior points [1, n-1) split into n_out - 2 buckets
+    bounds = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    starts, ends = bounds[:-1], bounds[1:]
+    # Average of each following bucket; the last bucket looks ahead to the final point
+    sizes = (ends - starts)[1:]
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], starts - 1)[1:] / sizes, x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], starts - 1)[1:] / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i]) * (ys - y[a]) - (x[a] - xs) * (avg_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(x, y, max_points=MAX_CHART_POINTS, keep=()):
+    """
+    Indices of at most `max_points` points of (x, y), always including the
+    first and last points and every index in `keep` (e.g. an intersection
+    month). Key points split the series into segments that are downsampled
+    with LTTB separately, each getting a share of the budget proportional
+    to its length, so a kept point never distorts its neighbours.
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    anchors = np.unique(np.concatenate([[0, n - 1], [k for k in keep if k is not None and 0 <= k < n]]))
+    anchors = anchors.astype(int)
+    budget = max_points - len(anchors)
+    if budget <= 0:
+        return anchors
+
+    # Interior points per segment, then a largest-remainder split of the budget
+    interior = np.diff(anchors) - 1
+    share = budget * interior / max(interior.sum(), 1)
+    alloc = np.floor(share).astype(int)
+    alloc[np.argsort(alloc - share)[:budget - alloc.sum()]] += 1
+    alloc = np.minimum(alloc, interior)
+
+    pieces = [anchors[:1]]
+    for lo, hi, n_interior in zip(anchors[:-1].tolist(), anchors[1:].tolist(), alloc.tolist()):
+        segment = lttb(x[lo:hi + 1], y[lo:hi + 1], n_interior + 2)
+        pieces.append(lo + segment[1:])
+    return np.concatenate(pieces)
+
+
+def chart_series(x, series, max_points=MAX_CHART_POINTS, keep=()):
+    """
+    Prepares several series that share an x axis for plotting.
+    The point budget is split evenly between the series, so the payload
+    stays the same size however long or numerous they are.
+    Returns {name: (x, y)} with each series downsampled on its own shape.
+    """
+    x = np.asarray(x)
+    per_series = max(max_points // max(len(series), 1), 3)
+    out = {}
+    for name, y in series.items():
+        y = np.asarray(y)
+        index = downsample(x, y, per_series, keep)
+        out[name] = (x[index], y[index])
+    return out
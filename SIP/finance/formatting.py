@@ -0,0 +1,121 @@
+import numpy as np
+
+# --- INDIAN NUMBERING ---
+# Digits are grouped 3 then 2 from the right: 12,34,56,789
+LAKH = 10**5
+CRORE = 10**7
+
+# int64 has at most 19 digits
+_MAX_DIGITS = 19
+_POWERS = 10 ** np.arange(_MAX_DIGITS, dtype=np.int64)
+# Position of digit k counted from the right, after the commas that precede it
+_CHAR_POS = np.array([k if k < 3 else k + (k - 3) // 2 + 1 for k in range(_MAX_DIGITS)])
+
+# np.strings (NumPy 2) concatenates in C; np.char is the older, per-element fallback
+_concat = np.strings.add if hasattr(np, "strings") else np.char.add
+
+
+def _group(n):
+    """
+    Indian-grouped digits of a non-negative integer.
+    """
+    s = str(n)
+    if len(s) <= 3:
+        return s
+    # Split the last 3 digits, then group the rest in pairs
+    remaining, out = s[:-3], s[-3:]
+    while len(remaining) > 2:
+        out = remaining[-2:] + "," + out
+        remaining = remaining[:-2]
+    return remaining + "," + out
+
+
+def format_currency(amount, symbol="₹"):
+    """
+    Formats a number into the Indian Numbering System (Lakhs/Crores).
+    Example: 100000 -> ₹1,00,000
+    """
+    try:
+        amount = int(round(amount))
+    except (ValueError, OverflowError):
+        return "—"  # NaN / inf
+    if amount < 0:
+        return f"-{symbol}{_group(-amount)}"
+    return f"{symbol}{_group(amount)}"
+
+
+def _group_array(n):
+    """
+    Indian-grouped digits for a 1-D array of non-negative int64, in bulk.
+    Digits and commas are laid out right-aligned in a fixed-width byte
+    matrix, each row is shifted left by its unused width and the matrix is
+    reinterpreted as fixed-width byte strings (trailing NULs drop away).
+    """
+    row_digits = np.searchsorted(_POWERS[1:], n, side="right") + 1
+    n_digits = int(row_digits.max()) if len(n) else 1
+    width = int(_CHAR_POS[n_digits - 1]) + 1
+
+    chars = np.full((len(n), width), ord(","), dtype=np.uint8)
+    remaining = n
+    for k in range(n_digits):
+        remaining, digit = np.divmod(remaining, 10)
+        chars[:, width - 1 - _CHAR_POS[k]] = digit + ord("0")
+
+    columns = (width - 1 - _CHAR_POS[row_digits - 1])[:, None] + np.arange(width)
+    left = np.take_along_axis(chars, np.minimum(columns, width - 1), axis=1)
+    left[columns >= width] = 0
+    return left.view(f"S{width}").ravel().astype(f"U{width}")
+
+
+def _decimals_table(decimals):
+    return np.array([f"{i:0{decimals}d}" for i in range(10**decimals)])
+
+
+def format_currency_array(values, symbol="₹", short=False, decimals=2):
+    """
+    Vectorized format_currency for whole columns: returns an array of
+    strings shaped like `values` (a str for scalar input).
+
+    short=True abbreviates to lakhs and crores with `decimals` places
+    (₹12.50 L, ₹3.75 Cr) and prints smaller amounts in full.
+    Non-finite values become "—".
+    """
+    values = np.asarray(values, dtype=float)
+    flat = values.ravel()
+    finite = np.isfinite(flat)
+    magnitude = np.where(finite, np.abs(flat), 0.0)
+    rounded = np.rint(magnitude).astype(np.int64)
+
+    if short:
+        scale = 10**decimals
+        in_lakhs = np.rint(magnitude / LAKH * scale)
+        in_crores = np.rint(magnitude / CRORE * scale)
+        # Pick the unit after rounding so 99,99,999 reads 1.00 Cr, not 100.00 L
+        use_crore = in_lakhs >= 100 * scale
+        use_lakh = ~use_crore & (rounded >= LAKH)
+        abbreviated = use_lakh | use_crore
+        fixed = np.where(use_crore, in_crores, in_lakhs).astype(np.int64)
+        text = _group_array(np.where(abbreviated, fixed // scale, rounded))
+        if decimals:
+            fraction = _concat(".", _decimals_table(decimals)[fixed % scale])
+            text = np.where(abbreviated, _concat(text, fraction), text)
+        text = _concat(text, np.select([use_crore, use_lakh], [" Cr", " L"], ""))
+    else:
+        text = _group_array(rounded)
+
+    # No sign on amounts that round to zero
+    negative = (flat < 0) & (rounded > 0)
+    text = _concat(np.where(negative, "-" + symbol, symbol), text)
+    text = np.where(finite, text, "—").reshape(values.shape)
+    return str(text) if text.ndim == 0 else text
+
+
+def format_frame(df, columns, **kwargs):
+    """
+    Copy of a DataFrame with `columns` replaced by formatted currency
+    strings, ready for st.dataframe without a per-cell Styler.
+    """
+    out = df.copy()
+    for column in columns:
+        out[column] = format_currency_array(df[column].to_numpy(), **kwargs)
+    return out
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+
+from .sip_engine import fund_terminal_value
+
+
+def _nominal_target(target, years, inflation_pct):
+    # A target in today's money has to be grown by inflation over the tenure
+    if not inflation_pct:
+        return target
+    return target * (1 + inflation_pct / 100) ** years
+
+
+def _portfolio_terminal(monthly_sip, years, step_up_pct, funds_config):
+    """
+    Final corpus of the whole portfolio, summed from the per-fund closed form.
+    """
+    return sum(
+        fund_terminal_value(float(monthly_sip * fund['allocation_pct'] / 100), years,
+                            float(step_up_pct), float(fund['return_pct']))[0]
+        for fund in funds_config
+    )
+
+
+def _bracketed_root(fn, lo, hi, tol=1e-9, max_iter=100):
+    """
+    Illinois (modified regula falsi) root finder on a sign-changing bracket.
+    Converges superlinearly on the smooth, monotone curves used here while
+    keeping the bracketing guarantee of bisection.
+    """
+    f_lo, f_hi = fn(lo), fn(hi)
+    side = 0
+    for _ in range(max_iter):
+        mid = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        f_mid = fn(mid)
+        if abs(f_mid) <= tol or hi - lo <= tol:
+            return mid
+        if (f_mid > 0) == (f_hi > 0):
+            hi, f_hi = mid, f_mid
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, f_lo = mid, f_mid
+            if side == 1:
+                f_hi /= 2
+            side = 1
+    return mid
+
+
+def required_sip(target, years, step_up_pct, funds_config, inflation_pct=None):
+    """
+    Starting monthly SIP that reaches `target` after `years`.
+    The corpus is linear in the SIP, so this is one closed-form evaluation.
+    """
+    unit_corpus = _portfolio_terminal(1.0, years, step_up_pct, funds_config)
+    return _nominal_target(target, years, inflation_pct) / unit_corpus
+
+
+def required_step_up(target, monthly_sip, years, funds_config, inflation_pct=None, max_step_up=100.0):
+    """
+    Annual step-up % needed to reach `target`.
+    Returns 0.0 if no step-up is needed and None if even `max_step_up` falls short.
+    """
+    goal = _nominal_target(target, years, inflation_pct)
+
+    def shortfall(step):
+        # Log gap is close to linear in the step-up and scale-free in the corpus size
+        return math.log(_portfolio_terminal(monthly_sip, years, step, funds_config) / goal)
+
+    if shortfall(0.0) >= 0:
+        return 0.0
+    if shortfall(max_step_up) < 0:
+        return None
+    return _bracketed_root(shortfall, 0.0, max_step_up, tol=1e-12)
+
+
+def required_tenure(target, monthly_sip, step_up_pct, funds_config, inflation_pct=None, max_years=50):
+    """
+    Smallest whole number of years after which the corpus reaches `target`
+    (in today's money when inflation_pct is given), or None within max_years.
+    """
+    years = np.arange(1, max_years + 1)
+    allocations = np.array([fund['allocation_pct'] for fund in funds_config], dtype=float)[:, None]
+    returns = np.array([fund['return_pct'] for fund in funds_config], dtype=float)[:, None]
+    # All funds x all candidate tenures in one closed-form evaluation
+    corpus = fund_terminal_value(monthly_sip * allocations / 100, years, step_up_pct, returns)[0].sum(axis=0)
+    if inflation_pct:
+        corpus = corpus / (1 + inflation_pct / 100) ** years
+    reached = np.flatnonzero(corpus >= target)
+    return int(years[reached[0]]) if reached.size else None
@@ -0,0 +1,201 @@
+import numpy as np
+
+from .memo import memoize
+from .results import frame_view, month_index
+from .sip_engine import fund_growth_curve
+
+DEFAULT_MONTHS = 240
+
+
+def first_month(mask):
+    """
+    1-based month of the first True along the last axis, 0 where there is none.
+    """
+    found = mask.any(axis=-1)
+    return np.where(found, mask.argmax(axis=-1) + 1, 0)
+
+
+def _month_grid(months):
+    # (years, 12) grid so only years + 12 exponentials are needed per scenario
+    years = -(-months // 12)
+    flatten = (lambda a: a.reshape(a.shape[:-2] + (years * 12,))[..., :months])
+    return years, np.arange(years)[:, None], np.arange(1, 13), flatten
+
+
+def loan_curve(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, months=DEFAULT_MONTHS):
+    """
+    Loan leg of the step-up model: returns (monthly_cont, loan, payoff_month).
+    Arguments broadcast together; the month axis is added last.
+    """
+    loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio = (
+        np.asarray(v, dtype=float)[..., None, None]
+        for v in (loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio)
+    )
+    years, year_index, month_in_year, flatten = _month_grid(months)
+
+    yearly_cont = initial_cont * np.exp(np.log1p(step_up_pct / 100) * year_index)
+    payment = emi + yearly_cont * split_ratio / 100
+
+    # B_m = v**-m * (B_0 - sum(payment_k * v**k)), v = 1 / (1 + monthly rate).
+    # Payments are positive, so the discounted total only grows: payoff is the
+    # first month it covers the opening balance, and the balance stays at zero after.
+    log_v = -np.log1p(rate / 1200)
+    discount = np.exp(12 * log_v * year_index) * np.exp(log_v * month_in_year)
+    paid = np.cumsum(flatten(payment * discount), axis=-1)
+    payoff_month = first_month(paid >= loan_bal[..., 0])
+    loan = np.maximum((loan_bal[..., 0] - paid) / flatten(discount), 0.0)
+
+    monthly_cont = flatten(np.broadcast_to(yearly_cont, yearly_cont.shape[:-1] + (12,)))
+    return monthly_cont, loan, payoff_month
+
+
+def sip_curve(initial_cont, step_up_pct, split_ratio, sip_return, months=DEFAULT_MONTHS):
+    """
+    SIP leg of the step-up model: the non-prepaid share of the contribution,
+    compounded monthly at sip_return / 12. Same invest-then-grow recurrence as
+    sip_engine, evaluated at the equivalent annual rate.
+    """
+    years = -(-months // 12)
+    annual_pct = np.expm1(12 * np.log1p(np.asarray(sip_return, dtype=float) / 1200)) * 100
+    monthly_sip = np.asarray(initial_cont, dtype=float) * (1 - np.asarray(split_ratio, dtype=float) / 100)
+    return fund_growth_curve(monthly_sip, years, step_up_pct, annual_pct)[..., :months]
+
+
+def stepup_curves(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return,
+                  months=DEFAULT_MONTHS):
+    """
+    Array form of the loan step-up model. Every argument may be a scalar or an
+    array; they broadcast together and the month axis is added last.
+
+    Each month the contribution (stepped up yearly) is split between loan
+    prepayment and a SIP. Returns (monthly_cont, loan, sip, payoff_month).
+    """
+    monthly_cont, loan, payoff_month = loan_curve(
+        loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, months
+    )
+    sip = sip_curve(initial_cont, step_up_pct, split_ratio, sip_return, months)
+    return monthly_cont, loan, sip, payoff_month
+
+
+class LoanResult:
+    """
+    Month-by-month output of the loan step-up model for one scenario.
+    Loan, SIP and contribution curves are rows of one (3, months) buffer and
+    `to_frame` wraps it without copying.
+    `intersect_month` is the first month the SIP value covers the remaining
+    loan (the "Freedom Date"), or None if it never does within the horizon.
+    """
+
+    __slots__ = ("buffer", "intersect_month", "payoff_month")
+
+    COLUMNS = ("Loan", "SIP", "Monthly_Cont")
+
+    def __init__(self, monthly_cont, loan, sip, intersect_month, payoff_month):
+        self.buffer = np.empty((3, len(loan)))
+        self.buffer[0] = loan
+        self.buffer[1] = sip
+        self.buffer[2] = monthly_cont
+        self.intersect_month = intersect_month
+        self.payoff_month = payoff_month
+
+    @property
+    def month(self):
+        return np.arange(1, self.buffer.shape[1] + 1)
+
+    @property
+    def loan(self):
+        return self.buffer[0]
+
+    @property
+    def sip(self):
+        return self.buffer[1]
+
+    @property
+    def monthly_cont(self):
+        return self.buffer[2]
+
+    def to_frame(self):
+        return frame_view(self.buffer, self.COLUMNS, month_index(self.buffer.shape[1]))
+
+
+def simulate_stepup_loan(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return,
+                         months=DEFAULT_MONTHS, until_payoff=False):
+    """
+    Runs the step-up strategy for a single scenario.
+    With `until_payoff`, the curves end at the payoff month instead of
+    running the full horizon with a zero balance. The closed form still
+    evaluates every month (there is no loop to exit), so this only trims the result.
+    """
+    monthly_cont, loan, sip, payoff = stepup_curves(
+        loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return, months
+    )
+    # The freedom month needs loan > 0, so it always falls on or before payoff
+    intersect = int(first_month((sip >= loan) & (loan > 0)))
+    payoff = int(payoff)
+    if until_payoff and payoff:
+        monthly_cont, loan, sip = (np.broadcast_to(monthly_cont, loan.shape)[:payoff], loan[:payoff], sip[:payoff])
+    return LoanResult(monthly_cont, loan, sip, intersect or None, payoff or None)
+
+
+class SweepResult:
+    """
+    Outcome surfaces over a split x step-up x rate x SIP-return grid.
+    `freedom_month` is 0 where the SIP never covers the loan within the horizon.
+    """
+
+    __slots__ = ("split_ratios", "step_ups", "rates", "sip_returns", "freedom_month", "final_net_worth")
+
+    def __init__(self, split_ratios, step_ups, rates, sip_returns, freedom_month, final_net_worth):
+        self.split_ratios = split_ratios
+        self.step_ups = step_ups
+        self.rates = rates
+        self.sip_returns = sip_returns
+        self.freedom_month = freedom_month
+        self.final_net_worth = final_net_worth
+
+    def surface(self, field, rate_index=0, sip_return_index=0):
+        """
+        2D (split x step-up) slice of `field` for one rate / SIP return pair.
+        """
+        return getattr(self, field)[:, :, rate_index, sip_return_index]
+
+
+def sweep_stepup(loan_bal, emi, initial_cont, split_ratios, step_ups, rates, sip_returns,
+                 months=DEFAULT_MONTHS):
+    """
+    Evaluates the step-up model for every combination of the given split
+    ratios, step-ups, rates and SIP returns in batched array passes.
+
+    The loan leg does not depend on the SIP return and the SIP leg does not
+    depend on the rate, so each is computed once on its own 3D sub-grid and
+    the two are only combined for the crossover test, one split ratio at a time
+    to keep the (step-ups x rates x returns x months) working set bounded.
+    """
+    # Copies, so the result (read-only once cached) never aliases the caller's arrays
+    split_ratios, step_ups, rates, sip_returns = (
+        np.array(a, dtype=float, ndmin=1) for a in (split_ratios, step_ups, rates, sip_returns)
+    )
+    _, loan, _ = loan_curve(
+        loan_bal, rates[None, None, :], emi, initial_cont,
+        step_ups[None, :, None], split_ratios[:, None, None], months
+    )                                                              # (split, step, rate, month)
+    sip = sip_curve(
+        initial_cont, step_ups[None, :, None], split_ratios[:, None, None],
+        sip_returns[None, None, :], months
+    )                                                              # (split, step, return, month)
+
+    freedom = np.empty((split_ratios.size, step_ups.size, rates.size, sip_returns.size), dtype=np.int32)
+    for i in range(split_ratios.size):
+        split_loan = loan[i][:, :, None, :]
+        freedom[i] = first_month((sip[i][:, None, :, :] >= split_loan) & (split_loan > 0))
+    net_worth = sip[:, :, None, :, -1] - loan[:, :, :, None, -1]
+
+    return SweepResult(split_ratios, step_ups, rates, sip_returns, freedom, net_worth)
+
+
+# --- MEMOIZED ENTRY POINTS ---
+# Shared across reruns and sessions; results must be treated as read-only.
+simulate_stepup_loan_cached = memoize(maxsize=256, max_bytes=32 * 2**20, name="simulate_stepup_loan")(
+    simulate_stepup_loan
+)
+sweep_stepup_cached = memoize(maxsize=64, max_bytes=64 * 2**20, name="sweep_stepup")(sweep_stepup)
@@ -0,0 +1,163 @@
+import functools
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["name", "hits", "misses", "evictions", "currsize", "maxsize", "nbytes"])
+
+# Every memoized function registers its cache here so diagnostics can list them
+_registry = {}
+
+
+def normalize(value, ndigits=6):
+    """
+    Hashable, canonical form of call arguments.
+    Floats are rounded so tiny widget jitter maps to the same key, dicts become
+    sorted item tuples and sequences / arrays become tuples.
+    """
+    if isinstance(value, float):
+        return round(value, ndigits)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize(v, ndigits)) for k, v in value.items()))
+    if hasattr(value, "tolist"):
+        # NumPy arrays and scalars
+        return normalize(value.tolist(), ndigits)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v, ndigits) for v in value)
+    return value
+
+
+def _sizeof(value, seen=None):
+    """
+    Approximate memory held by a cached value. Array views are charged once,
+    against the buffer they share.
+    """
+    seen = set() if seen is None else seen
+    if hasattr(value, "nbytes"):
+        root = value
+        while getattr(root, "base", None) is not None and hasattr(root.base, "nbytes"):
+            root = root.base
+        if id(root) in seen:
+            return 0
+        seen.add(id(root))
+        return root.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(v, seen) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(v, seen) for v in value.values())
+    attrs = [getattr(value, name) for name in getattr(type(value), "__slots__", ()) if hasattr(value, name)]
+    attrs += list(getattr(value, "__dict__", {}).values())
+    return sys.getsizeof(value) + sum(_sizeof(v, seen) for v in attrs)
+
+
+def _freeze(value, seen=None):
+    """
+    Marks every array reachable from a cached value read-only, so a caller
+    writing into a shared result (or a zero-copy DataFrame over it) fails
+    instead of changing the entry for everyone else.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    if hasattr(value, "flags") and hasattr(value, "nbytes"):
+        value.flags.writeable = False
+        return
+    if isinstance(value, (list, tuple)):
+        children = value
+    elif isinstance(value, dict):
+        children = value.values()
+    else:
+        children = [getattr(value, name) for name in getattr(type(value), "__slots__", ()) if hasattr(value, name)]
+        children += list(getattr(value, "__dict__", {}).values())
+    for child in children:
+        _freeze(child, seen)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and, optionally, total bytes.
+    """
+
+    def __init__(self, name, maxsize=128, max_bytes=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns (found, value) and marks the entry as most recently used.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = _sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self.nbytes += size
+            while self._data and (len(self._data) > self.maxsize
+                                  or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return CacheInfo(self.name, self.hits, self.misses, self.evictions,
+                         len(self._data), self.maxsize, self.nbytes)
+
+
+def memoize(maxsize=128, max_bytes=None, ndigits=6, name=None):
+    """
+    Decorator caching a pure function on the normalized form of its arguments.
+    Cached results are shared between callers; the arrays in them are made
+    read-only before they are stored.
+    """
+    def decorator(func):
+        cache = LRUCache(name or func.__qualname__, maxsize, max_bytes)
+        _registry[cache.name] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = normalize((args, kwargs), ndigits)
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                _freeze(value)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """
+    CacheInfo for every memoized function, with the hit rate added.
+    """
+    stats = {}
+    for name, cache in _registry.items():
+        info = cache.info()
+        lookups = info.hits + info.misses
+        stats[name] = dict(info._asdict(), hit_rate=info.hits / lookups if lookups else 0.0)
+    return stats
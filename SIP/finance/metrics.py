@@ -0,0 +1,294 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+from . import IMPORTED_AT
+from .memo import cache_stats
+
+# --- CONFIGURATION ---
+# ARTHAFLOW_METRICS=1 turns recording on; ARTHAFLOW_METRICS_FILE is where the
+# Prometheus text exposition is written every ARTHAFLOW_METRICS_INTERVAL seconds.
+_enabled = os.environ.get("ARTHAFLOW_METRICS", "0").lower() not in ("", "0", "false", "no")
+METRICS_FILE = os.environ.get("ARTHAFLOW_METRICS_FILE")
+EXPORT_INTERVAL = float(os.environ.get("ARTHAFLOW_METRICS_INTERVAL", 15))
+PREFIX = "arthaflow_"
+
+# Latency buckets in seconds: 10us to ~60s in steps of sqrt(2), so a bucket
+# quantile is within ~20% of the true value from cache hits to timeouts
+BUCKETS = tuple(round(1e-5 * 2 ** (k / 2), 9) for k in range(46))
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def disable():
+    enable(False)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus layout: cumulative on export).
+    """
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimate from the buckets, interpolating linearly inside the bucket
+        that holds the q-th observation (as histogram_quantile does).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+# (name, sorted label items) -> Histogram / float
+_histograms = {}
+_counters = {}
+_startup = {}
+_lock = threading.Lock()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, value, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+
+def increment(name, value=1, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class Stopwatch:
+    """
+    Times one stage into `stage_seconds{stage=...}`; stop() records it.
+    Usable as a context manager.
+    """
+
+    __slots__ = ("stage", "labels", "started")
+
+    def __init__(self, stage, **labels):
+        self.stage = stage
+        self.labels = labels
+        self.started = time.perf_counter()
+
+    def stop(self):
+        elapsed = time.perf_counter() - self.started
+        observe("stage_seconds", elapsed, stage=self.stage, **self.labels)
+        return elapsed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+_NULL_TIMER = nullcontext()
+
+
+class _NullStopwatch:
+    def stop(self):
+        return None
+
+
+_NULL_STOPWATCH = _NullStopwatch()
+
+
+def timer(stage, **labels):
+    """
+    `with timer("render_growth_chart"):` - a shared no-op when disabled.
+    """
+    return Stopwatch(stage, **labels) if _enabled else _NULL_TIMER
+
+
+def stopwatch(stage, **labels):
+    """
+    Stopwatch for spans that do not fit a with-block (e.g. a whole rerun).
+    """
+    return Stopwatch(stage, **labels) if _enabled else _NULL_STOPWATCH
+
+
+def timed(stage):
+    """
+    Decorator timing every call of a function as `stage`. When disabled the
+    only cost is one flag check per call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe("stage_seconds", time.perf_counter() - started, stage=stage)
+        return wrapper
+    return decorator
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# --- STARTUP ---
+def mark_startup(page, phase):
+    """
+    Records the seconds from the first import of SIP.finance to `phase` of
+    `page`'s first run in this process: "imports" once its modules are
+    loaded, "first_paint" when its script first finishes. Kept once per
+    page and phase whether or not recording is on (a cold start happens
+    before anyone can turn it on) and survives reset().
+    """
+    with _lock:
+        _startup.setdefault((page, phase), time.perf_counter() - IMPORTED_AT)
+
+
+# --- REPORTING ---
+def snapshot():
+    """
+    Current values for the diagnostics page: histograms with count, mean,
+    p50 and p99 (seconds), counters, startup marks and the memoization
+    cache stats.
+    """
+    with _lock:
+        histograms = [
+            dict(name=name, labels=dict(labels), count=h.count, mean=h.sum / h.count if h.count else None,
+                 p50=h.quantile(0.5), p99=h.quantile(0.99))
+            for (name, labels), h in sorted(_histograms.items())
+        ]
+        counters = [dict(name=name, labels=dict(labels), value=value)
+                    for (name, labels), value in sorted(_counters.items())]
+        startup = [dict(page=page, phase=phase, seconds=seconds) for (page, phase), seconds in _startup.items()]
+    return {"enabled": _enabled, "histograms": histograms, "counters": counters, "startup": startup,
+            "caches": cache_stats()}
+
+
+def _labels(items):
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus():
+    """
+    Prometheus text exposition of every metric, plus cache gauges.
+    """
+    with _lock:
+        histograms = [(name, labels, list(h.counts), h.count, h.sum) for (name, labels), h in sorted(_histograms.items())]
+        counters = sorted(_counters.items())
+        startup = sorted(_startup.items())
+
+    lines, typed = [], set()
+    for name, labels, counts, count, total in histograms:
+        metric = PREFIX + name
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} histogram")
+            typed.add(metric)
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+            lines.append(f"{metric}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{metric}_sum{_labels(labels)} {total:.9g}")
+        lines.append(f"{metric}_count{_labels(labels)} {count}")
+
+    for (name, labels), value in counters:
+        metric = PREFIX + name
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_labels(labels)} {value}")
+
+    if startup:
+        lines.append(f"# TYPE {PREFIX}startup_seconds gauge")
+        lines.extend(f"{PREFIX}startup_seconds{_labels((('page', page), ('phase', phase)))} {seconds:.6g}"
+                     for (page, phase), seconds in startup)
+
+    caches = cache_stats()
+    for field, metric, kind in (("hits", "cache_hits_total", "counter"), ("misses", "cache_misses_total", "counter"),
+                                ("evictions", "cache_evictions_total", "counter"), ("hit_rate", "cache_hit_ratio", "gauge"),
+                                ("currsize", "cache_entries", "gauge"), ("nbytes", "cache_bytes", "gauge")):
+        lines.append(f"# TYPE {PREFIX}{metric} {kind}")
+        lines.extend(f"{PREFIX}{metric}{_labels((('cache', name),))} {info[field]:.6g}" for name, info in sorted(caches.items()))
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=METRICS_FILE):
+    """
+    Writes the exposition atomically (for the node_exporter textfile collector).
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        fh.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(path=METRICS_FILE, interval=EXPORT_INTERVAL):
+    """
+    Rewrites the metrics file every `interval` seconds on a daemon thread.
+    Does nothing unless metrics are enabled and a file is configured; safe
+    to call on every rerun.
+    """
+    global _exporter
+    if not (_enabled and path):
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            def run():
+                while True:
+                    try:
+                        write_prometheus(path)
+                    except OSError:
+                        pass
+                    time.sleep(interval)
+
+            _exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+            _exporter.start()
+        return _exporter
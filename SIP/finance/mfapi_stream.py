@@ -0,0 +1,141 @@
+import json
+import re
+from array import array
+from datetime import date
+
+import numpy as np
+
+# One {"date": "dd-mm-yyyy", "nav": "123.45"} row of an mfapi.in payload
+_ROW = re.compile(rb'"date"\s*:\s*"(\d\d-\d\d-\d{4})"\s*,\s*"nav"\s*:\s*"([^"]*)"')
+CHUNK_SIZE = 64 * 1024
+# A row is ~40 bytes; anything longer than this after the last match cannot be a partial row
+_MAX_ROW_BYTES = 256
+
+
+def _ordinal(value):
+    return date(int(value[6:10]), int(value[3:5]), int(value[0:2])).toordinal()
+
+
+def _ordinals(day, month, year):
+    """
+    Vectorized proleptic Gregorian date -> date.toordinal() (days-from-civil).
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 305
+
+
+def iter_rows(chunks):
+    """
+    Yields (ordinal, nav) rows from an mfapi.in payload as its bytes arrive.
+    Only the unparsed tail of the stream is buffered, so a consumer that stops
+    early never downloads or decodes the rest of the history. Rows whose NAV
+    is not a number are skipped.
+    """
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        end = 0
+        for match in _ROW.finditer(buffer):
+            end = match.end()
+            value, nav = match.groups()
+            try:
+                yield _ordinal(value), float(nav)
+            except ValueError:
+                continue
+        # Keep whatever follows the last complete row: it may be cut mid-object
+        buffer = buffer[end:] if end else buffer[-_MAX_ROW_BYTES:]
+
+
+def _decode_rows(rows, dates, navs):
+    """
+    Appends findall() rows (newest first) to the output arrays, converting
+    the dates of the whole batch at once.
+    """
+    values, raw_navs = zip(*rows)
+    digits = (np.frombuffer(b"".join(values), dtype=np.uint8).reshape(-1, 10) - ord("0")).astype(np.int32)
+    ordinals = _ordinals(
+        digits[:, 0] * 10 + digits[:, 1],
+        digits[:, 3] * 10 + digits[:, 4],
+        digits[:, 6] * 1000 + digits[:, 7] * 100 + digits[:, 8] * 10 + digits[:, 9],
+    )
+    try:
+        navs.extend(map(float, raw_navs))
+    except ValueError:
+        # Rare non-numeric NAVs ("N.A."): drop those rows only
+        del navs[len(dates):]
+        keep = [i for i, nav in enumerate(raw_navs) if _is_number(nav)]
+        ordinals = ordinals[keep]
+        navs.extend(float(raw_navs[i]) for i in keep)
+    dates.frombytes(ordinals.astype(np.int32).tobytes())
+
+
+def parse_payload(payload, window=CHUNK_SIZE):
+    """
+    Decodes a complete payload straight into (array('i') date ordinals,
+    array('d') NAVs), oldest row first, without building per-row dicts.
+    Rows are decoded one window at a time so only a window's worth of
+    intermediate objects is alive at once. Falls back to the json module if
+    the payload does not use the expected row layout.
+    """
+    dates, navs = array("i"), array("d")
+    start, found = 0, 0
+    while start < len(payload):
+        # Cut each window after a closing brace so no row straddles two windows
+        cut = payload.rfind(b"}", start, start + window)
+        end = len(payload) if cut == -1 or start + window >= len(payload) else cut + 1
+        rows = _ROW.findall(payload, start, end)
+        if rows:
+            found += len(rows)
+            _decode_rows(rows, dates, navs)
+        start = end
+
+    if found != payload.count(b'"date"'):
+        return _parse_with_json(payload)
+    dates.reverse()
+    navs.reverse()
+    return dates, navs
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_with_json(payload):
+    dates, navs = array("i"), array("d")
+    for row in reversed(json.loads(payload)["data"]):
+        if _is_number(row["nav"]):
+            dates.append(_ordinal(row["date"]))
+            navs.append(float(row["nav"]))
+    return dates, navs
+
+
+def read_rows(response, after=None, limit=None, chunk_size=CHUNK_SIZE):
+    """
+    Streams rows from a `requests` response opened with stream=True.
+
+    mfapi.in lists the newest NAV first, so reading stops (and the connection
+    is released) at the first row dated on or before `after`, or once `limit`
+    rows have been read. Returns arrays ordered oldest first.
+    """
+    dates, navs = array("i"), array("d")
+    try:
+        for ordinal, nav in iter_rows(response.iter_content(chunk_size)):
+            if after is not None and ordinal <= after:
+                break
+            dates.append(ordinal)
+            navs.append(nav)
+            if limit is not None and len(dates) >= limit:
+                break
+    finally:
+        response.close()
+    dates.reverse()
+    navs.reverse()
+    return dates, navs
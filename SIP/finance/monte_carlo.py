@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .data_fetcher import scheme_code
+from .nav_series import EPOCH_ORDINAL
+from .nav_store import default_store
+from .results import frame_view, year_index
+
+
+def month_end_returns(history):
+    """
+    Monthly simple returns from the last NAV of each calendar month.
+    Returns (months, returns): months as datetime64[M] keys for the month
+    the return was earned in.
+    """
+    dates = np.frombuffer(history.dates, dtype=np.int32) - EPOCH_ORDINAL
+    navs = np.frombuffer(history.navs, dtype=np.float64)
+    months = dates.astype("datetime64[D]").astype("datetime64[M]")
+    # History is sorted, so a month's last NAV sits right before the month key changes
+    last_in_month = np.flatnonzero(np.append(months[1:] != months[:-1], True))
+    month_navs = navs[last_in_month]
+    return months[last_in_month][1:], month_navs[1:] / month_navs[:-1] - 1
+
+
+def align_returns(histories):
+    """
+    Stacks monthly returns of several funds on the months they all share.
+    Returns (months, matrix) with matrix shaped (months, funds).
+    """
+    series = [month_end_returns(h) for h in histories]
+    common = series[0][0]
+    for months, _ in series[1:]:
+        common = np.intersect1d(common, months)
+    matrix = np.column_stack([rets[np.searchsorted(months, common)] for months, rets in series])
+    return common, matrix
+
+
+def load_monthly_returns(categories):
+    """
+    Aligned monthly return matrix for SCHEME_MAP categories or scheme codes, from the NAV store.
+    """
+    store = default_store()
+    return align_returns([store.get(scheme_code(cat)) for cat in categories])
+
+
+class MonteCarloResult:
+    """
+    Year-end portfolio values for every simulated path, shaped (paths, years),
+    with the summary statistics the planner shows.
+    """
+
+    __slots__ = ("yearly_paths", "total_invested")
+
+    def __init__(self, yearly_paths, total_invested):
+        self.yearly_paths = yearly_paths
+        self.total_invested = total_invested
+
+    @property
+    def final_values(self):
+        return self.yearly_paths[:, -1]
+
+    def percentile_bands(self, percentiles=(10, 50, 90)):
+        """
+        Year-by-year percentile bands, shaped (len(percentiles), years).
+        """
+        return np.percentile(self.yearly_paths, percentiles, axis=0)
+
+    def bands_frame(self, percentiles=(10, 50, 90)):
+        """
+        Percentile bands as a DataFrame indexed by year, columns "P10", "P50", ...
+        """
+        bands = self.percentile_bands(percentiles)
+        return frame_view(bands, [f"P{p:g}" for p in percentiles], year_index(bands.shape[1]))
+
+    def probability_of_goal(self, goal):
+        return float(np.mean(self.final_values >= goal))
+
+
+def _simulate_chunk(args):
+    """
+    Runs one chunk of bootstrapped paths. Module-level so it can be shipped
+    to pool workers.
+    """
+    returns, fund_sips, years, step_up_pct, block_months, n_paths, seed = args
+    rng = np.random.default_rng(seed)
+    months = years * 12
+    n_history = returns.shape[0]
+    block_months = min(block_months, n_history)
+
+    # Same sampled month for every fund keeps their historical correlation intact
+    n_blocks = -(-months // block_months)
+    starts = rng.integers(0, n_history - block_months + 1, size=(n_paths, n_blocks))
+    offsets = np.arange(months)[:, None]
+    # Month-major layout so each step reads one contiguous row of indices
+    month_index = starts.T[offsets // block_months, np.arange(n_paths)] + offsets % block_months
+
+    growth = 1 + returns
+    step_factors = (1 + step_up_pct / 100) ** np.arange(years)
+    corpus = np.zeros((n_paths, returns.shape[1]))
+    yearly = np.empty((n_paths, years))
+    for m in range(months):
+        # Invest then grow, as in calculate_fund_growth
+        corpus += fund_sips * step_factors[m // 12]
+        corpus *= growth[month_index[m]]
+        if m % 12 == 11:
+            yearly[:, m // 12] = corpus.sum(axis=1)
+    return yearly
+
+
+def run_monte_carlo(returns, fund_sips, years, step_up_pct, n_paths=10000,
+                    block_months=12, seed=None, workers=None, chunk_paths=5000):
+    """
+    Block-bootstraps historical monthly returns into `n_paths` SIP paths.
+
+    returns: (history_months, funds) matrix from align_returns / load_monthly_returns
+    fund_sips: starting monthly SIP per fund (same order as the return columns)
+
+    Chunks run on a process pool when more than one worker is available;
+    each chunk gets an independent child seed so results are reproducible.
+    Raises ValueError when the funds share no months of history.
+    """
+    returns = np.asarray(returns, dtype=float)
+    fund_sips = np.asarray(fund_sips, dtype=float)
+    if returns.ndim != 2 or returns.shape[0] == 0:
+        raise ValueError("No shared NAV history for these funds")
+    sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(returns, fund_sips, years, step_up_pct, block_months, size, s)
+            for size, s in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        chunks = [_simulate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            chunks = list(pool.map(_simulate_chunk, jobs))
+
+    invested = fund_sips.sum() * 12 * ((1 + step_up_pct / 100) ** np.arange(years)).sum()
+    return MonteCarloResult(np.concatenate(chunks), float(invested))
@@ -0,0 +1,125 @@
+from datetime import date
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+# date.toordinal() of 1970-01-01, NumPy's datetime64 epoch
+EPOCH_ORDINAL = 719163
+ROLLING_WINDOWS = (1, 3, 5, 10)
+
+
+def _ordinal(day):
+    """
+    Accepts a datetime.date / datetime or a date ordinal.
+    """
+    return day.toordinal() if isinstance(day, date) else int(day)
+
+
+class NavSeries:
+    """
+    NAV history indexed by date.
+    `dates` (int32 date ordinals, strictly increasing) and `navs` are NumPy
+    views over the store's arrays, so building a series copies nothing.
+    Lookups are binary searches on the date index, not row-count guesses,
+    which keeps them exact across holidays and gaps in the data.
+    """
+
+    __slots__ = ("code", "dates", "navs")
+
+    def __init__(self, dates, navs, code=None):
+        self.code = code
+        self.dates = np.asarray(dates)
+        self.navs = np.asarray(navs, dtype=np.float64)
+
+    @classmethod
+    def from_history(cls, history):
+        return cls(np.frombuffer(history.dates, dtype=np.int32),
+                   np.frombuffer(history.navs, dtype=np.float64), history.code)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def first_date(self):
+        return date.fromordinal(int(self.dates[0]))
+
+    @property
+    def last_date(self):
+        return date.fromordinal(int(self.dates[-1]))
+
+    def index_as_of(self, day):
+        """
+        Position of the last NAV published on or before `day`; -1 if the
+        series starts after it.
+        """
+        return int(np.searchsorted(self.dates, _ordinal(day), side="right")) - 1
+
+    def as_of(self, day):
+        """
+        (date, nav) of the last NAV published on or before `day`, or None.
+        """
+        i = self.index_as_of(day)
+        if i < 0:
+            return None
+        return date.fromordinal(int(self.dates[i])), float(self.navs[i])
+
+    def cagr(self, years, end=None):
+        """
+        Annualized return over the `years` ending at `end` (default: latest NAV).
+        The start falls back to the first NAV when the history is shorter.
+        Returns (cagr_pct, actual_years); actual_years is 0 if there is no span.
+        """
+        end_i = len(self) - 1 if end is None else self.index_as_of(end)
+        if end_i < 0:
+            return None, 0.0
+        target = int(self.dates[end_i]) - round(years * DAYS_PER_YEAR)
+        start_i = max(self.index_as_of(target), 0)
+        actual_years = (int(self.dates[end_i]) - int(self.dates[start_i])) / DAYS_PER_YEAR
+        if actual_years <= 0:
+            return None, 0.0
+        return float((self.navs[end_i] / self.navs[start_i]) ** (1 / actual_years) - 1) * 100, actual_years
+
+    def rolling_cagr(self, years):
+        """
+        CAGR for every start date with a full `years` window after it, in one
+        vectorized pass. Each window ends on the last NAV on or before
+        start + years, and is annualized over its actual span. Starts whose
+        window holds no later NAV are skipped.
+        Returns (start_ordinals, cagr_pct); both empty if history is too short.
+        """
+        span = round(years * DAYS_PER_YEAR)
+        starts = np.flatnonzero(self.dates <= self.dates[-1] - span) if len(self) else np.empty(0, int)
+        ends = np.searchsorted(self.dates, self.dates[starts] + span, side="right") - 1
+        # A NAV gap longer than the window (suspended or merged scheme) leaves no end
+        # after the start; skip those, as cagr() does when actual_years <= 0
+        valid = ends > starts
+        starts, ends = starts[valid], ends[valid]
+        actual_years = (self.dates[ends] - self.dates[starts]) / DAYS_PER_YEAR
+        cagr = (np.power(self.navs[ends] / self.navs[starts], 1 / actual_years) - 1) * 100
+        return self.dates[starts], cagr
+
+    def rolling_cagrs(self, windows=ROLLING_WINDOWS):
+        """
+        {years: (start_ordinals, cagr_pct)} for each rolling window.
+        """
+        return {years: self.rolling_cagr(years) for years in windows}
+
+
+def to_datetime64(ordinals):
+    """
+    Date ordinals -> datetime64[D], for charts and month arithmetic.
+    """
+    return (np.asarray(ordinals) - EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def return_distribution(cagr, percentiles=(10, 25, 50, 75, 90)):
+    """
+    Summary of a rolling-CAGR sample: count, worst, best and the percentiles.
+    None when the sample is empty.
+    """
+    if len(cagr) == 0:
+        return None
+    summary = {"windows": len(cagr), "worst": float(cagr.min()), "best": float(cagr.max()),
+               "positive_share": float(np.mean(cagr > 0))}
+    summary.update({f"p{p}": float(v) for p, v in zip(percentiles, np.percentile(cagr, percentiles))})
+    return summary
@@ -0,0 +1,320 @@
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import date, timedelta
+
+from .circuit import CircuitOpenError, breaker_for
+from .metrics import observe
+
+# --- STORE CONFIGURATION ---
+# Override with ARTHAFLOW_CACHE_DIR / ARTHAFLOW_NAV_TTL (seconds) when deploying
+CACHE_DIR = os.environ.get(
+    "ARTHAFLOW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "arthaflow")
+)
+DEFAULT_TTL = float(os.environ.get("ARTHAFLOW_NAV_TTL", 6 * 3600))
+API_URL = "https://api.mfapi.in/mf/{code}"
+
+# File layout: header, then int32 date ordinals, then float64 NAVs (both oldest first)
+_MAGIC = b"NAV1"
+_HEADER = struct.Struct("<4sId")
+
+
+def pooled_session(pool_size=16):
+    """
+    Keep-alive session whose connection pool is large enough for every
+    scheme to be fetched concurrently over reused connections.
+    """
+    # requests is only needed once something is downloaded
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class NavHistory:
+    """
+    Columnar NAV history for one scheme: parallel arrays of date ordinals
+    and float NAVs, sorted oldest to newest.
+    """
+
+    __slots__ = ("code", "dates", "navs", "synced_at")
+
+    def __init__(self, code, dates=None, navs=None, synced_at=0.0):
+        self.code = code
+        self.dates = dates if dates is not None else array("i")
+        self.navs = navs if navs is not None else array("d")
+        self.synced_at = synced_at
+
+    def __len__(self):
+        return len(self.navs)
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def extend(self, rows):
+        """
+        Appends (ordinal, nav) rows that are newer than the last stored day.
+        Returns the number of rows added.
+        """
+        last = self.last_date if self.dates else -1
+        added = 0
+        for ordinal, nav in sorted(rows):
+            if ordinal > last:
+                self.dates.append(ordinal)
+                self.navs.append(nav)
+                last = ordinal
+                added += 1
+        return added
+
+    def extend_arrays(self, dates, navs):
+        """
+        Appends oldest-first arrays in one go when they continue the history
+        cleanly (strictly increasing, after the last stored day); otherwise
+        falls back to the row-by-row merge.
+        """
+        last = self.last_date if self.dates else -1
+        ordered = all(a < b for a, b in zip(dates, dates[1:]))
+        if ordered and (not dates or dates[0] > last):
+            self.dates.extend(dates)
+            self.navs.extend(navs)
+            return len(dates)
+        return self.extend(zip(dates, navs))
+
+
+class NavStore:
+    """
+    Local NAV store keyed by scheme code.
+    Histories are persisted under `root` and topped up from mfapi.in once the
+    TTL has expired, requesting only the days after the last synced date.
+    Network access goes through the mfapi.in circuit breaker: while it is open,
+    stored copies are served as-is and a background probe retries the host.
+    With `background_refresh`, an expired copy is also served as-is while a
+    background sync replaces it (stale-while-revalidate), so only a scheme
+    with nothing stored yet ever waits on the network.
+    """
+
+    def __init__(self, root=CACHE_DIR, ttl=DEFAULT_TTL, session=None, timeout=10, breaker=None,
+                 api_url=API_URL, background_refresh=False):
+        self.root = root
+        self.ttl = ttl
+        self._session = session
+        self.timeout = timeout
+        self.api_url = api_url
+        self.breaker = breaker or breaker_for(api_url)
+        self.background_refresh = background_refresh
+        self._memory = {}
+        self._locks = {}
+        self._refreshing = set()
+        self._guard = threading.Lock()
+
+    @property
+    def session(self):
+        # Created on first download, so building a store stays import-light
+        if self._session is None:
+            with self._guard:
+                if self._session is None:
+                    self._session = pooled_session()
+        return self._session
+
+    def path_for(self, code):
+        return os.path.join(self.root, f"{code}.nav")
+
+    def _lock_for(self, code):
+        with self._guard:
+            return self._locks.setdefault(code, threading.Lock())
+
+    # --- DISK I/O ---
+    def load(self, code):
+        path = self.path_for(code)
+        try:
+            with open(path, "rb") as fh:
+                magic, count, synced_at = _HEADER.unpack(fh.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return None
+                dates, navs = array("i"), array("d")
+                dates.fromfile(fh, count)
+                navs.fromfile(fh, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return NavHistory(code, dates, navs, synced_at)
+
+    def save(self, history):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path_for(history.code)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, len(history), history.synced_at))
+            history.dates.tofile(fh)
+            history.navs.tofile(fh)
+        # Atomic swap so concurrent readers never see a half-written file
+        os.replace(tmp_path, path)
+
+    # --- NETWORK SYNC ---
+    def _download(self, code, since=None):
+        """
+        Returns (dates, navs) arrays, oldest first, for the days after `since`.
+        Payloads are decoded straight into arrays; top-ups are streamed and
+        the connection is dropped as soon as an already-stored day shows up.
+        """
+        from .mfapi_stream import parse_payload, read_rows
+
+        url = self.api_url.format(code=code)
+        kind = "full" if since is None else "incremental"
+        started, outcome = time.perf_counter(), "error"
+        try:
+            if since is None:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                result = parse_payload(response.content)
+            else:
+                params = {
+                    "startDate": (date.fromordinal(since) + timedelta(days=1)).isoformat(),
+                    "endDate": date.today().isoformat(),
+                }
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=True)
+                response.raise_for_status()
+                result = read_rows(response, after=since)
+            outcome = "ok"
+            return result
+        finally:
+            # Download plus decode, as the caller waits for it
+            observe("http_request_seconds", time.perf_counter() - started, kind=kind, outcome=outcome)
+
+    def sync(self, code, history=None):
+        """
+        Brings a history up to date, downloading only the rows newer than
+        what is already stored.
+        """
+        base = history or self.load(code) or NavHistory(code)
+        dates, navs = self._download(code, since=base.last_date)
+        # Extend a copy so readers holding the old history never see a partial update
+        history = NavHistory(code, array("i", base.dates), array("d", base.navs))
+        history.extend_arrays(dates, navs)
+        history.synced_at = time.time()
+        if len(history) == 0:
+            raise ValueError(f"No NAV data returned for scheme {code}")
+        self.save(history)
+        return history
+
+    def _refresh(self, code):
+        with self._lock_for(code):
+            self._memory[code] = self.sync(code, self._memory.get(code))
+
+    def refresh(self, code):
+        """
+        Syncs `code` now, through the circuit breaker. Returns False without
+        touching the network while the circuit is open.
+        """
+        code = str(code)
+        if not self.breaker.allow_request():
+            return False
+        try:
+            self._refresh(code)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return True
+
+    def refresh_in_background(self, code):
+        """
+        Starts refresh(code) on a daemon thread unless one is already running
+        for that scheme. Never blocks.
+        """
+        code = str(code)
+        with self._guard:
+            if code in self._refreshing:
+                return False
+            self._refreshing.add(code)
+
+        def run():
+            try:
+                self.refresh(code)
+            except Exception:
+                pass  # the stale copy keeps being served; the breaker has the failure
+            finally:
+                with self._guard:
+                    self._refreshing.discard(code)
+
+        threading.Thread(target=run, name=f"nav-refresh-{code}", daemon=True).start()
+        return True
+
+    def is_stale(self, history):
+        return (time.time() - history.synced_at) >= self.ttl
+
+    def _revalidate(self, code, history):
+        # Serve the expired copy now; the network round trip happens off the request path
+        if self.breaker.allow_request():
+            self.refresh_in_background(code)
+        else:
+            self.breaker.probe_in_background(lambda: self._refresh(code))
+        return history
+
+    def get(self, code, max_age=None):
+        """
+        Returns the NAV history for `code`, refreshing it when older than the TTL.
+        A stale copy is returned if the refresh fails or the circuit is open;
+        an error is raised only when nothing has been stored yet.
+        """
+        code = str(code)
+        ttl = self.ttl if max_age is None else max_age
+        history = self._memory.get(code)
+        if history is not None and (time.time() - history.synced_at) < ttl:
+            return history
+        if history is not None and self.background_refresh:
+            # Checked before taking the scheme lock, which a running refresh holds
+            return self._revalidate(code, history)
+
+        with self._lock_for(code):
+            history = self._memory.get(code) or self.load(code)
+            expired = history is None or (time.time() - history.synced_at) >= ttl
+            if expired and self.background_refresh and history is not None and len(history):
+                self._memory[code] = history
+                return self._revalidate(code, history)
+            if expired:
+                if not self.breaker.allow_request():
+                    # Fail fast: no request waits on a host that is known to be down
+                    self.breaker.probe_in_background(lambda: self._refresh(code))
+                    if history is None or len(history) == 0:
+                        raise CircuitOpenError(f"{self.breaker.name} is unavailable")
+                    self._memory[code] = history
+                    return history
+                try:
+                    history = self.sync(code, history)
+                    self.breaker.record_success()
+                except Exception:
+                    self.breaker.record_failure()
+                    if history is None or len(history) == 0:
+                        raise
+            self._memory[code] = history
+            return history
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = NavStore()
+        return _default_store
+
+
+def set_default_store(store):
+    """
+    Replaces the process-wide store (e.g. to point it at a local mirror).
+    Returns the previous store.
+    """
+    global _default_store
+    with _default_lock:
+        previous, _default_store = _default_store, store
+        return previous
@@ -1,33 +1,219 @@
-from .sip_engine import calculate_fund_growth
+import numpy as np
 
+from .memo import memoize
+from .metrics import timed
+from .results import FundSummary, frame_view, month_index, year_index
+from .sip_engine import fund_growth_curve, fund_terminal_value
+
+
+@memoize(maxsize=512, name="unit_growth_curve")
+def unit_growth_curve(annual_return_pct, step_up_pct, years):
+    """
+    Corpus curve for a 1 rupee starting SIP. The model is linear in the SIP,
+    so any fund's history is this curve scaled by its SIP. Read-only, shared.
+    """
+    return fund_growth_curve(1.0, years, step_up_pct, annual_return_pct)
+
+
+class PortfolioResult:
+    """
+    Array-backed portfolio output.
+    All curves live in one buffer of shape (..., funds + 1, months): rows
+    [0, funds) hold each fund's corpus and the last row holds the combined
+    curve. `combined`, `fund_curves`, `final_values` and `yearly` are views
+    into that buffer, not copies, so a result costs little beyond the buffer.
+    """
+
+    __slots__ = ("buffer", "names", "fund_invested")
+
+    def __init__(self, buffer, fund_invested, names=None):
+        self.buffer = buffer
+        self.names = list(names) if names is not None else None
+        self.fund_invested = fund_invested
+
+    @property
+    def n_funds(self):
+        # Per-fund rows are absent when the batch was run with per_fund=False
+        return self.buffer.shape[-2] - 1
+
+    @property
+    def combined(self):
+        return self.buffer[..., -1, :]
+
+    @property
+    def yearly(self):
+        return self.buffer[..., -1, 11::12]
+
+    @property
+    def fund_curves(self):
+        return self.buffer[..., :-1, :] if self.n_funds else None
+
+    @property
+    def final_values(self):
+        return self.buffer[..., :-1, -1] if self.n_funds else None
+
+    @property
+    def final_corpus(self):
+        return self.combined[..., -1]
+
+    @property
+    def total_invested(self):
+        return self.fund_invested.sum(axis=-1)
+
+    def _columns(self):
+        names = self.names or [f"Fund {i + 1}" for i in range(self.n_funds)]
+        return list(names[:self.n_funds]) + ["Total"]
+
+    def to_frame(self, yearly=False):
+        """
+        One portfolio's curves as a DataFrame (one column per fund plus
+        "Total"), monthly or at each year end. Columns are views into the buffer.
+        """
+        if self.buffer.ndim != 2:
+            raise ValueError("to_frame needs a single portfolio; index the batch first")
+        if yearly:
+            block = self.buffer[:, 11::12]
+            return frame_view(block, self._columns(), year_index(block.shape[1]))
+        return frame_view(self.buffer, self._columns(), month_index(self.buffer.shape[1]))
+
+    def fund_summary(self):
+        return FundSummary(self._columns()[:-1], self.final_values, self.fund_invested)
+
+
+def simulate_portfolio_batch(total_sip, years, step_up_pct, allocations, returns,
+                             names=None, per_fund=True):
+    """
+    Evaluates one or many portfolios in a single vectorized pass.
+
+    allocations: (funds,) or (portfolios, funds) allocation percentages
+    returns: (funds,) annual return % per fund, or (portfolios, funds)
+    total_sip: scalar or (portfolios,) monthly SIP
+
+    Unit-SIP curves are built once per fund and scaled by each fund's SIP.
+    With per_fund=False only the combined curves are computed (a single
+    matrix product), which is the cheap path for scoring thousands of mixes.
+    """
+    allocations = np.asarray(allocations, dtype=float)
+    if allocations.shape[-1:] == (0,):
+        raise ValueError("simulate_portfolio_batch needs at least one fund")
+    weights = np.asarray(total_sip, dtype=float)[..., None] * allocations / 100
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        unit_curves = np.stack([unit_growth_curve(r, step_up_pct, years) for r in returns.tolist()])
+    else:
+        unit_curves = fund_growth_curve(1.0, years, step_up_pct, returns)
+    months = years * 12
+
+    batch_shape = np.broadcast_shapes(weights.shape, unit_curves.shape[:-1])[:-1]
+    n_funds = weights.shape[-1]
+
+    if per_fund:
+        buffer = np.empty(batch_shape + (n_funds + 1, months))
+        np.multiply(weights[..., None], unit_curves, out=buffer[..., :-1, :])
+        np.sum(buffer[..., :-1, :], axis=-2, out=buffer[..., -1, :])
+    else:
+        buffer = np.empty(batch_shape + (1, months))
+        buffer[..., 0, :] = np.matmul(weights[..., None, :], unit_curves)[..., 0, :]
+
+    _, unit_invested = fund_terminal_value(1.0, years, step_up_pct, 0.0)
+    return PortfolioResult(buffer, weights * unit_invested, names)
+
+
+@timed("simulate_portfolio")
 def simulate_portfolio(total_sip, years, step_up_pct, funds_config):
     """
     funds_config: List of dicts {name, allocation_pct, return_pct}
+    Returns (monthly combined corpus, FundSummary, total invested); the corpus
+    is None for an empty funds_config, as before the batch engine.
+    """
+    if not funds_config:
+        return None, FundSummary([], [], []), 0.0
+    result = simulate_portfolio_batch(
+        total_sip, years, step_up_pct,
+        [fund['allocation_pct'] for fund in funds_config],
+        [fund['return_pct'] for fund in funds_config],
+        names=[fund['name'] for fund in funds_config],
+    )
+    return result.combined, result.fund_summary(), float(result.total_invested)
+
+
+class IncrementalPortfolio:
+    """
+    Portfolio history maintained from cached unit-SIP curves.
+    Changing one fund's allocation adds (new SIP - old SIP) x its unit curve to
+    the combined history, a single scaled vector add, instead of re-simulating.
     """
-    combined_history = None
-    fund_results = []
-    total_portfolio_invested = 0.0
-
-    for fund in funds_config:
-        # Calculate fund-specific SIP based on allocation
-        fund_sip = total_sip * (fund['allocation_pct'] / 100)
-        
-        history, invested = calculate_fund_growth(
-            fund_sip, years, step_up_pct, fund['return_pct']
-        )
-        
-        total_portfolio_invested += invested
-        fund_results.append({
-            "name": fund['name'],
-            "final_value": history[-1],
-            "total_invested": invested
-        })
-        
-        # Aggregate history for the chart
-        if combined_history is None:
-            combined_history = [0.0] * len(history)
-        
-        for i in range(len(history)):
-            combined_history[i] += history[i]
-            
-    return combined_history, fund_results, total_portfolio_invested
\ No newline at end of file
+
+    # Rebuild from scratch now and then so repeated adds cannot accumulate drift
+    REBUILD_EVERY = 256
+
+    def __init__(self, total_sip, years, step_up_pct, funds_config):
+        self.total_sip = total_sip
+        self.years = years
+        self.step_up_pct = step_up_pct
+        self._unit_invested = fund_terminal_value(1.0, years, float(step_up_pct), 0.0)[1]
+        self.rebuild(funds_config)
+
+    def matches(self, total_sip, years, step_up_pct):
+        return (total_sip, years, step_up_pct) == (self.total_sip, self.years, self.step_up_pct)
+
+    def rebuild(self, funds_config):
+        self.funds = [dict(f) for f in funds_config]
+        self.combined = np.zeros(self.years * 12)
+        for fund in self.funds:
+            self.combined += self._fund_sip(fund) * self._unit(fund)
+        self._updates = 0
+
+    def _fund_sip(self, fund):
+        return self.total_sip * fund['allocation_pct'] / 100
+
+    def _unit(self, fund):
+        return unit_growth_curve(fund['return_pct'], self.step_up_pct, self.years)
+
+    def update(self, index, allocation_pct=None, return_pct=None):
+        """
+        Applies a new allocation and/or return to the fund at `index`.
+        """
+        fund = self.funds[index]
+        allocation_pct = fund['allocation_pct'] if allocation_pct is None else allocation_pct
+        return_pct = fund['return_pct'] if return_pct is None else return_pct
+        if (allocation_pct, return_pct) == (fund['allocation_pct'], fund['return_pct']):
+            return
+
+        old_sip, old_unit = self._fund_sip(fund), self._unit(fund)
+        fund['allocation_pct'], fund['return_pct'] = allocation_pct, return_pct
+        self._updates += 1
+        if self._updates >= self.REBUILD_EVERY:
+            self.rebuild(self.funds)
+            return
+        new_unit = self._unit(fund)
+        if new_unit is old_unit:
+            self.combined += (self._fund_sip(fund) - old_sip) * new_unit
+        else:
+            self.combined -= old_sip * old_unit
+            self.combined += self._fund_sip(fund) * new_unit
+
+    @timed("portfolio_sync")
+    def sync(self, funds_config):
+        """
+        Brings the portfolio in line with `funds_config`, touching only the
+        funds whose allocation or return changed.
+        """
+        if [f['name'] for f in funds_config] != [f['name'] for f in self.funds]:
+            self.rebuild(funds_config)
+            return
+        for index, fund in enumerate(funds_config):
+            self.update(index, fund['allocation_pct'], fund['return_pct'])
+
+    @property
+    def total_invested(self):
+        return float(self.total_sip * self._unit_invested
+                     * sum(f['allocation_pct'] for f in self.funds) / 100)
+
+    def fund_results(self):
+        """
+        Per-fund FundSummary, as simulate_portfolio returns it.
+        """
+        sips = np.array([self._fund_sip(f) for f in self.funds])
+        finals = np.array([self._unit(f)[-1] for f in self.funds])
+        return FundSummary([f['name'] for f in self.funds], sips * finals, sips * self._unit_invested)
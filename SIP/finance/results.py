@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def month_index(months):
+    import pandas as pd
+
+    return pd.RangeIndex(1, months + 1, name="Month")
+
+
+def year_index(years):
+    import pandas as pd
+
+    return pd.RangeIndex(1, years + 1, name="Year")
+
+
+def frame_view(block, columns, index=None):
+    """
+    DataFrame over a (fields, rows) float block without copying it.
+    The transpose of a C-contiguous block is exactly the single 2-D block
+    pandas stores internally, so the frame's columns are views into `block`.
+    """
+    import pandas as pd
+
+    return pd.DataFrame(block.T, index=index, columns=list(columns), copy=False)
+
+
+class FundSummary:
+    """
+    Per-fund outcome of one portfolio: final value and amount invested for
+    each fund, stored as rows of a single (2, funds) buffer.
+    """
+
+    __slots__ = ("names", "values")
+
+    def __init__(self, names, final_values, total_invested):
+        self.names = tuple(names)
+        self.values = np.empty((2, len(self.names)))
+        self.values[0] = final_values
+        self.values[1] = total_invested
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def final_values(self):
+        return self.values[0]
+
+    @property
+    def total_invested(self):
+        return self.values[1]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return frame_view(self.values, ["final_value", "total_invested"],
+                          pd.Index(self.names, name="name"))
@@ -0,0 +1,501 @@
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+from .circuit import CircuitOpenError
+from .metrics import timed
+from .nav_store import default_store
+
+# --- INDEX CONFIGURATION ---
+# The scheme list changes slowly (new NFOs, merged schemes); one download a day is plenty.
+# Override with ARTHAFLOW_INDEX_TTL (seconds).
+INDEX_TTL = float(os.environ.get("ARTHAFLOW_INDEX_TTL", 24 * 3600))
+INDEX_FILE = "schemes.json"
+
+# Trigram similarity a misspelt word needs to match a vocabulary word
+FUZZY_THRESHOLD = 0.45
+
+# Fund houses as they start scheme names; the first alias that matches wins
+AMCS = (
+    ("360 ONE", ("360 one", "iifl")),
+    ("Aditya Birla Sun Life", ("aditya birla sun life", "birla sun life", "absl")),
+    ("Axis", ("axis",)),
+    ("Bajaj Finserv", ("bajaj finserv",)),
+    ("Bandhan", ("bandhan", "idfc")),
+    ("Bank of India", ("bank of india", "boi axa", "boi")),
+    ("Baroda BNP Paribas", ("baroda bnp paribas", "baroda", "bnp paribas")),
+    ("Canara Robeco", ("canara robeco",)),
+    ("DSP", ("dsp",)),
+    ("Edelweiss", ("edelweiss",)),
+    ("Franklin Templeton", ("franklin", "templeton")),
+    ("Groww", ("groww", "indiabulls")),
+    ("HDFC", ("hdfc",)),
+    ("Helios", ("helios",)),
+    ("HSBC", ("hsbc", "l and t")),
+    ("ICICI Prudential", ("icici prudential", "icici")),
+    ("IDBI", ("idbi",)),
+    ("Invesco", ("invesco", "religare")),
+    ("ITI", ("iti",)),
+    ("JM Financial", ("jm financial", "jm")),
+    ("Kotak Mahindra", ("kotak",)),
+    ("LIC", ("lic",)),
+    ("Mahindra Manulife", ("mahindra manulife", "mahindra")),
+    ("Mirae Asset", ("mirae asset", "mirae")),
+    ("Motilal Oswal", ("motilal oswal",)),
+    ("Navi", ("navi", "essel")),
+    ("Nippon India", ("nippon india", "reliance")),
+    ("NJ", ("nj",)),
+    ("Old Bridge", ("old bridge",)),
+    ("PGIM India", ("pgim india", "dhfl pramerica", "pramerica")),
+    ("PPFAS", ("parag parikh", "ppfas")),
+    ("Quant", ("quant",)),
+    ("Quantum", ("quantum",)),
+    ("Samco", ("samco",)),
+    ("SBI", ("sbi",)),
+    ("Shriram", ("shriram",)),
+    ("Sundaram", ("sundaram", "principal")),
+    ("Tata", ("tata",)),
+    ("Taurus", ("taurus",)),
+    ("Trust", ("trust",)),
+    ("Union", ("union",)),
+    ("UTI", ("uti",)),
+    ("WhiteOak Capital", ("whiteoak capital", "whiteoak")),
+    ("Zerodha", ("zerodha",)),
+)
+
+# SEBI-style categories, highest priority first: a name containing keywords
+# of several categories (e.g. "Nifty Midcap 150 Index Fund") gets the first.
+CATEGORIES = (
+    ("Fixed Maturity", ("fixed maturity", "fmp", "interval fund", "fixed term", "capital protection")),
+    ("Fund of Funds", ("fund of fund", "fund of funds", "fof")),
+    ("ETF", ("etf", "bees", "exchange traded")),
+    ("Index Fund", ("index fund", "index")),
+    ("ELSS", ("elss", "tax saver", "tax saving", "taxsaver", "long term equity", "tax relief")),
+    ("Liquid", ("liquid",)),
+    ("Overnight", ("overnight",)),
+    ("Money Market", ("money market",)),
+    ("Arbitrage", ("arbitrage",)),
+    ("Gilt", ("gilt", "g sec", "government securities", "constant maturity")),
+    ("Banking & PSU", ("banking and psu", "banking psu")),
+    ("Corporate Bond", ("corporate bond", "corporate debt")),
+    ("Credit Risk", ("credit risk", "credit opportunities")),
+    ("Ultra Short Duration", ("ultra short",)),
+    ("Low Duration", ("low duration",)),
+    ("Short Duration", ("short duration", "short term")),
+    ("Medium Duration", ("medium duration", "medium term")),
+    ("Long Duration", ("long duration",)),
+    ("Dynamic Bond", ("dynamic bond",)),
+    ("Floater", ("floater", "floating rate")),
+    ("Balanced Advantage", ("balanced advantage", "dynamic asset allocation")),
+    ("Multi Asset", ("multi asset",)),
+    ("Equity Savings", ("equity savings",)),
+    ("Aggressive Hybrid", ("aggressive hybrid", "equity hybrid", "hybrid equity", "balanced fund", "equity and debt")),
+    ("Conservative Hybrid", ("conservative hybrid", "hybrid debt", "monthly income", "mip", "regular savings")),
+    ("Solution Oriented", ("retirement", "pension", "children", "child")),
+    ("Large & Mid Cap", ("large and mid cap", "large and midcap", "large mid cap", "emerging bluechip")),
+    ("Small Cap", ("small cap", "smallcap")),
+    ("Mid Cap", ("mid cap", "midcap")),
+    ("Large Cap", ("large cap", "largecap", "bluechip", "blue chip", "top 100", "top 200")),
+    ("Flexi Cap", ("flexi cap", "flexicap")),
+    ("Multi Cap", ("multi cap", "multicap")),
+    ("Focused", ("focused", "focus")),
+    ("Value / Contra", ("value", "contra")),
+    ("Dividend Yield", ("dividend yield",)),
+    ("Gold & Silver", ("gold", "silver")),
+    ("Sectoral / Thematic", ("banking", "financial services", "pharma", "healthcare", "infrastructure", "infra",
+                             "technology", "digital", "consumption", "psu", "energy", "manufacturing", "esg",
+                             "international", "global", "us equity", "nasdaq", "business cycle", "innovation",
+                             "mnc", "auto", "fmcg", "realty", "defence")),
+    ("Debt", ("debt", "bond", "income", "treasury", "savings", "gilt")),
+    ("Equity", ("equity", "growth fund", "opportunities")),
+)
+PLANS = ("Direct", "Regular")
+OPTIONS = ("Growth", "IDCW")
+OTHER = "Other"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9\n]+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _normalize(name):
+    # "HDFC Mid-Cap Opportunities - Direct Plan" -> "hdfc mid cap opportunities direct plan "
+    # Line breaks survive, so several names can be normalized in one call
+    return _NON_ALNUM.sub(" ", name.lower().replace("&", " and "))
+
+
+def _trie_regex(words):
+    """
+    Alternation of `words` factored by common prefix ("sma(?:ll cap|llcap)"),
+    so the regex engine tries one branch per character instead of every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        optional = "" in node
+        body = branches[0] if len(branches) == 1 and not optional else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body += "?"
+        return body
+
+    return render(trie)
+
+
+def _keyword_pattern(keywords, anchored=False):
+    alternatives = _trie_regex(keywords)
+    # Multiline: applied to all names at once, one name per line
+    return re.compile(("^ *" if anchored else r"\b") + f"({alternatives})" + r"\b", re.MULTILINE)
+
+
+_AMC_OF_ALIAS = {alias: i for i, (_, aliases) in enumerate(AMCS) for alias in aliases}
+_AMC_PATTERN = _keyword_pattern(_AMC_OF_ALIAS, anchored=True)
+_CATEGORY_OF_KEYWORD = {}
+for _i, (_, _keywords) in enumerate(CATEGORIES):
+    for _keyword in _keywords:
+        _CATEGORY_OF_KEYWORD.setdefault(_keyword, _i)
+_CATEGORY_PATTERN = _keyword_pattern(_CATEGORY_OF_KEYWORD)
+_IDCW_WORDS = {"idcw", "dividend", "payout", "reinvestment", "bonus"}
+
+
+def _trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SchemeIndex:
+    """
+    In-memory search index over the mfapi.in scheme list.
+
+    Every word of every scheme name goes into one sorted vocabulary whose
+    postings (scheme positions) are stored word by word in a single array.
+    All words sharing a prefix are adjacent in the vocabulary, so a prefix
+    lookup is two bisections and one contiguous slice of postings. Words
+    with no prefix hit fall back to trigram similarity over the vocabulary
+    to absorb typos. AMC, category, plan and option are derived from the
+    names once and kept as small integer columns for filtering.
+    """
+
+    def __init__(self, codes, names):
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.names = list(names)
+        self._position = {int(code): i for i, code in enumerate(self.codes.tolist())}
+        # All names normalized as one text, one line per scheme: a single regex
+        # pass each for normalizing and classifying instead of one per name
+        text = _normalize("\n".join(name.replace("\n", " ") for name in self.names))
+        normalized = [line.strip() for line in text.split("\n")]
+        self.name_length = np.fromiter((len(n) for n in normalized), dtype=np.int64, count=len(normalized))
+        self._build_postings(normalized)
+        self._classify(text)
+        self._trigram_index = None  # built on the first fuzzy lookup
+
+    @classmethod
+    def from_list(cls, entries):
+        """
+        From the mfapi.in /mf payload: [{"schemeCode": ..., "schemeName": ...}, ...].
+        """
+        entries = [e for e in entries if e.get("schemeCode") and e.get("schemeName")]
+        return cls([e["schemeCode"] for e in entries], [e["schemeName"].strip() for e in entries])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return _as_code(code) in self._position
+
+    # --- BUILD ---
+    def _build_postings(self, normalized):
+        ids, word_ids, owners = {}, [], []
+        for i, name in enumerate(normalized):
+            for word in set(name.split()):
+                word_ids.append(ids.setdefault(word, len(ids)))
+                owners.append(i)
+        self.vocab = sorted(ids)
+        rank = np.empty(len(ids), dtype=np.int64)
+        rank[[ids[word] for word in self.vocab]] = np.arange(len(ids))
+        word_ids = rank[np.asarray(word_ids, dtype=np.int64)]
+        order = np.argsort(word_ids, kind="stable")
+        self.postings = np.asarray(owners, dtype=np.int32)[order]
+        # Postings of vocabulary word k: postings[offsets[k]:offsets[k + 1]]
+        self.offsets = np.searchsorted(word_ids[order], np.arange(len(ids) + 1))
+        # Alphabetical rank of every name, the final tie-break in rankings
+        self.alpha_rank = np.empty(len(normalized), dtype=np.int64)
+        self.alpha_rank[sorted(range(len(normalized)), key=normalized.__getitem__)] = np.arange(len(normalized))
+
+    def _word_postings(self, word):
+        k = bisect_left(self.vocab, word)
+        if k < len(self.vocab) and self.vocab[k] == word:
+            return self._postings(k, k + 1)
+        return self.postings[:0]
+
+    def _classify(self, text):
+        n = len(self.codes)
+        line_starts = np.flatnonzero(np.frombuffer(text.encode("ascii"), dtype=np.uint8) == 10) + 1
+        line_starts = np.concatenate([[0], line_starts])
+
+        def lines_of(matches):
+            # Scheme position and keyword of every match in the joined text
+            found = [(m.start(), m.group(1)) for m in matches]
+            starts = np.fromiter((pos for pos, _ in found), dtype=np.int64, count=len(found))
+            return np.searchsorted(line_starts, starts, side="right") - 1, [k for _, k in found]
+
+        amc = np.full(n, len(AMCS), dtype=np.int16)
+        rows, aliases = lines_of(_AMC_PATTERN.finditer(text))
+        amc[rows] = [_AMC_OF_ALIAS[a] for a in aliases]
+
+        # Highest-priority (lowest) category among every keyword in the name
+        category = np.full(n, len(CATEGORIES), dtype=np.int16)
+        rows, keywords = lines_of(_CATEGORY_PATTERN.finditer(text))
+        np.minimum.at(category, rows, np.array([_CATEGORY_OF_KEYWORD[k] for k in keywords], dtype=np.int16))
+
+        # Later assignments win: "direct" over "regular", "growth" over IDCW words
+        plan = np.full(n, len(PLANS), dtype=np.int8)
+        plan[self._word_postings("regular")] = 1
+        plan[self._word_postings("direct")] = 0
+        option = np.full(n, len(OPTIONS), dtype=np.int8)
+        for word in _IDCW_WORDS:
+            option[self._word_postings(word)] = 1
+        option[self._word_postings("growth")] = 0
+        self.amc, self.category, self.plan, self.option = amc, category, plan, option
+
+    def _build_trigrams(self):
+        grams = {}
+        for k, word in enumerate(self.vocab):
+            for gram in _trigrams(word):
+                grams.setdefault(gram, []).append(k)
+        self._trigram_index = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in grams.items()}
+        self._trigram_count = np.fromiter((len(_trigrams(w)) for w in self.vocab), dtype=np.int32, count=len(self.vocab))
+
+    # --- LOOKUP ---
+    def _prefix_range(self, word):
+        lo = bisect_left(self.vocab, word)
+        hi = bisect_left(self.vocab, word + "\uffff", lo)
+        return lo, hi
+
+    def _postings(self, lo, hi):
+        return self.postings[self.offsets[lo]:self.offsets[hi]]
+
+    def _fuzzy_words(self, word):
+        """
+        Vocabulary ids of words similar to `word` (Jaccard over trigrams).
+        """
+        if self._trigram_index is None:
+            self._build_trigrams()
+        query = _trigrams(word)
+        grams = [self._trigram_index[g] for g in query if g in self._trigram_index]
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+        shared = np.bincount(np.concatenate(grams), minlength=len(self.vocab))
+        similarity = shared / (len(query) + self._trigram_count - shared)
+        return np.flatnonzero(similarity >= FUZZY_THRESHOLD)
+
+    def _filter_mask(self, amc=None, category=None, plan=None, option=None):
+        mask = None
+        for column, labels, value in ((self.amc, [a for a, _ in AMCS], amc),
+                                      (self.category, [c for c, _ in CATEGORIES], category),
+                                      (self.plan, PLANS, plan), (self.option, OPTIONS, option)):
+            if value is None:
+                continue
+            if value in labels:
+                index = labels.index(value)
+            elif value == OTHER:
+                index = len(labels)
+            else:
+                # Unknown value (e.g. a typo): matches nothing rather than the "Other" bucket
+                index = -1
+            selected = column == index
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    @timed("scheme_search")
+    def search(self, query, limit=20, amc=None, category=None, plan=None, option=None, fuzzy=True):
+        """
+        Schemes matching every word of `query` as a word prefix ("hdfc mid dir"),
+        restricted by the optional filters. Words with no prefix match are
+        matched fuzzily when `fuzzy` is set. Whole-word matches rank first,
+        then shorter (more canonical) names. Returns up to `limit` scheme dicts.
+        """
+        words = _WORD.findall(query.lower().replace("&", " and "))
+        n = len(self.codes)
+        candidates = None
+        # Narrowest word first, so the candidate set shrinks as fast as possible
+        matches = []
+        for word in dict.fromkeys(words):
+            lo, hi = self._prefix_range(word)
+            if lo < hi:
+                matches.append((self.offsets[hi] - self.offsets[lo], word, self._postings(lo, hi)))
+            elif fuzzy and len(word) >= 3:
+                similar = self._fuzzy_words(word)
+                postings = np.concatenate([self._postings(k, k + 1) for k in similar.tolist()]
+                                          or [np.empty(0, dtype=np.int32)])
+                matches.append((len(postings), word, postings))
+            else:
+                return []
+        matches.sort(key=lambda m: m[0])
+        for _, word, postings in matches:
+            mask = np.zeros(n, dtype=bool)
+            mask[postings] = True
+            candidates = np.flatnonzero(mask) if candidates is None else candidates[mask[candidates]]
+            if not len(candidates):
+                return []
+        if candidates is None:
+            candidates = np.arange(n)
+
+        filter_mask = self._filter_mask(amc, category, plan, option)
+        if filter_mask is not None:
+            candidates = candidates[filter_mask[candidates]]
+        if not len(candidates):
+            return []
+
+        # Rank: whole-word matches desc, then name length, then alphabetical
+        score = np.zeros(len(candidates), dtype=np.int64)
+        for _, word, _ in matches:
+            exact = self._word_postings(word)
+            if len(exact):
+                mask = np.zeros(n, dtype=bool)
+                mask[exact] = True
+                score += mask[candidates]
+        key = (-score * 1024 + np.minimum(self.name_length[candidates], 1023)) * n + self.alpha_rank[candidates]
+        if len(key) > limit:
+            top = np.argpartition(key, limit)[:limit]
+            top = top[np.argsort(key[top])]
+        else:
+            top = np.argsort(key)
+        return [self._scheme_at(i) for i in candidates[top].tolist()]
+
+    def _scheme_at(self, i):
+        amc, category = int(self.amc[i]), int(self.category[i])
+        plan, option = int(self.plan[i]), int(self.option[i])
+        return {
+            "code": str(self.codes[i]),
+            "name": self.names[i],
+            "amc": AMCS[amc][0] if amc < len(AMCS) else OTHER,
+            "category": CATEGORIES[category][0] if category < len(CATEGORIES) else OTHER,
+            "plan": PLANS[plan] if plan < len(PLANS) else OTHER,
+            "option": OPTIONS[option] if option < len(OPTIONS) else OTHER,
+        }
+
+    def scheme(self, code):
+        """
+        Scheme dict for a scheme code, or None when the code is not listed.
+        """
+        i = self._position.get(_as_code(code))
+        return None if i is None else self._scheme_at(i)
+
+    def name_of(self, code, default=None):
+        i = self._position.get(_as_code(code))
+        return default if i is None else self.names[i]
+
+    def amcs(self):
+        present = np.unique(self.amc)
+        return [AMCS[i][0] for i in present.tolist() if i < len(AMCS)]
+
+    def categories(self):
+        present = np.unique(self.category)
+        return [CATEGORIES[i][0] for i in present.tolist() if i < len(CATEGORIES)]
+
+
+def _as_code(code):
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+# --- LOADING ---
+def _index_path(store):
+    return os.path.join(store.root, INDEX_FILE)
+
+
+def _download_list(store):
+    # The scheme list lives next to the per-scheme endpoint: .../mf/{code} -> .../mf
+    url = store.api_url.rsplit("/", 1)[0]
+    if not store.breaker.allow_request():
+        raise CircuitOpenError(f"{store.breaker.name} is unavailable")
+    try:
+        response = store.session.get(url, timeout=store.timeout * 3)
+        response.raise_for_status()
+        entries = response.json()
+    except Exception:
+        store.breaker.record_failure()
+        raise
+    store.breaker.record_success()
+    return entries
+
+
+def load_scheme_index(store=None, max_age=INDEX_TTL):
+    """
+    SchemeIndex from the copy cached next to the NAV files, downloading the
+    list again once it is older than `max_age`. A failed download falls
+    back to the cached copy, however old.
+    """
+    store = store or default_store()
+    path = _index_path(store)
+    cached = None
+    try:
+        if time.time() - os.path.getmtime(path) < max_age:
+            with open(path, encoding="utf-8") as fh:
+                return SchemeIndex.from_list(json.load(fh))
+        cached = path
+    except (OSError, ValueError):
+        pass
+
+    try:
+        entries = _download_list(store)
+    except Exception:
+        if cached is None:
+            raise
+        with open(cached, encoding="utf-8") as fh:
+            return SchemeIndex.from_list(json.load(fh))
+
+    os.makedirs(store.root, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(entries, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return SchemeIndex.from_list(entries)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def scheme_index():
+    """
+    Process-wide SchemeIndex, loaded on first use. Raises when the list was
+    never downloaded and mfapi.in is unreachable.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_scheme_index()
+        return _index
+
+
+def loaded_scheme_index():
+    """
+    The process-wide index if it is already in memory, else None (never blocks on I/O).
+    """
+    return _index
+
+
+def search_schemes(query, limit=20, **filters):
+    """
+    scheme_index().search(...), or [] while the scheme list is unavailable.
+    """
+    try:
+        index = scheme_index()
+    except Exception:
+        return []
+    return index.search(query, limit, **filters)
@@ -1,26 +1,92 @@
+import math
+
+import numpy as np
+
+
+def _geom_sum(log_ratio, n):
+    """
+    sum(ratio**j for j in range(n)) written in log space.
+    expm1 keeps it accurate when the ratio is close to 1 (e.g. step-up ~ return).
+    """
+    flat = log_ratio == 0
+    out = np.expm1(n * log_ratio) / np.where(flat, 1.0, np.expm1(log_ratio))
+    return np.where(flat, n, out)
+
+
+def _growth_terms(step_up_pct, annual_return_pct):
+    # Monthly log-growth and yearly log step-up shared by the curve and terminal paths
+    log_g = np.log1p(np.asarray(annual_return_pct, dtype=float) / 100) / 12
+    log_f = np.log1p(np.asarray(step_up_pct, dtype=float) / 100)
+    return log_g, log_f
+
+
+def _year_start_corpus(initial_sip, log_g, log_f, year_index, year_factor):
+    """
+    Corpus at the start of each year, from the per-year geometric series:
+    C_y = S * A * sum(f**j * G**(y-1-j) for j < y), with A = g + g**2 + ... + g**12.
+    """
+    return (initial_sip * year_factor
+            * np.exp(12 * log_g * (year_index - 1))
+            * _geom_sum(log_f - 12 * log_g, year_index))
+
+
+def fund_growth_curve(initial_sip, years, step_up_pct, annual_return_pct):
+    """
+    Vectorized month-by-month corpus for a step-up SIP.
+    Scalar inputs give a (years * 12,) array; array inputs broadcast and add the
+    month axis last, so a batch of N funds returns an (N, years * 12) matrix.
+    """
+    log_g, log_f = _growth_terms(step_up_pct, annual_return_pct)
+    initial_sip = np.asarray(initial_sip, dtype=float)[..., None, None]
+    log_g, log_f = log_g[..., None, None], log_f[..., None, None]
+
+    # Evaluate on a (years, 12) grid: only years + 12 exponentials, then one fused multiply-add
+    year_index = np.arange(years)[:, None]
+    growth = np.exp(log_g * np.arange(1, 13))    # g**k
+    annuity = np.cumsum(growth, axis=-1)         # g + ... + g**k
+    start = _year_start_corpus(initial_sip, log_g, log_f, year_index, annuity[..., -1:])
+    current_sip = initial_sip * np.exp(log_f * year_index)
+    # Invest then grow: the opening corpus compounds and each month's SIP adds g**k terms
+    curve = start * growth + current_sip * annuity
+    return curve.reshape(curve.shape[:-2] + (years * 12,))
+
+
+def _scalar_geom_sum(log_ratio, n):
+    return n if log_ratio == 0 else math.expm1(n * log_ratio) / math.expm1(log_ratio)
+
+
+def _terminal_value_scalar(initial_sip, years, step_up_pct, annual_return_pct):
+    # Same closed form as the array path, in plain floats to skip NumPy call overhead
+    log_g = math.log1p(annual_return_pct / 100) / 12
+    log_f = math.log1p(step_up_pct / 100)
+    year_factor = math.exp(log_g) * _scalar_geom_sum(log_g, 12)
+    corpus = (initial_sip * year_factor * math.exp(12 * log_g * (years - 1))
+              * _scalar_geom_sum(log_f - 12 * log_g, years))
+    return corpus, 12 * initial_sip * _scalar_geom_sum(log_f, years)
+
+
+def fund_terminal_value(initial_sip, years, step_up_pct, annual_return_pct):
+    """
+    O(1) closed form for the final corpus and total invested, without building the curve.
+    Accepts scalars or broadcastable arrays.
+    """
+    if all(isinstance(v, (int, float)) for v in (initial_sip, years, step_up_pct, annual_return_pct)):
+        return _terminal_value_scalar(initial_sip, years, step_up_pct, annual_return_pct)
+
+    log_g, log_f = _growth_terms(step_up_pct, annual_return_pct)
+    initial_sip = np.asarray(initial_sip, dtype=float)
+    years = np.asarray(years)
+    year_factor = np.exp(log_g) * _geom_sum(log_g, 12)
+    corpus = _year_start_corpus(initial_sip, log_g, log_f, years, year_factor)
+    invested = 12 * initial_sip * _geom_sum(log_f, years)
+    return corpus, invested
+
+
 def calculate_fund_growth(initial_sip, years, step_up_pct, annual_return_pct):
     """
     Calculates month-by-month growth for a single fund with annual step-up.
     Returns a list of monthly corpus values.
     """
-    monthly_rate = (1 + (annual_return_pct / 100)) ** (1 / 12) - 1
-    step_up_factor = 1 + (step_up_pct / 100)
-    
-    corpus = 0.0
-    total_invested = 0.0
-    monthly_history = []
-    
-    for month in range(1, (years * 12) + 1):
-        # Determine current year (0-indexed) to apply step-up
-        year_index = (month - 1) // 12
-        current_sip = initial_sip * (step_up_factor ** year_index)
-        
-        # Calculation logic: Invest then grow
-        corpus = (corpus + current_sip) * (1 + monthly_rate)
-        total_invested += current_sip
-        
-        # Store data points (optional: store only year-ends for charts, 
-        # but we'll return all for flexibility)
-        monthly_history.append(corpus)
-        
-    return monthly_history, total_invested
\ No newline at end of file
+    history = fund_growth_curve(initial_sip, years, step_up_pct, annual_return_pct)
+    _, total_invested = fund_terminal_value(initial_sip, years, step_up_pct, annual_return_pct)
+    return history.tolist(), float(total_invested)
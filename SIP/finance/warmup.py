@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .nav_store import DEFAULT_TTL, default_store
+
+# Refresh well inside the TTL so requests find a fresh copy in steady state.
+# Override with ARTHAFLOW_REFRESH_INTERVAL (seconds).
+REFRESH_INTERVAL = float(os.environ.get("ARTHAFLOW_REFRESH_INTERVAL", DEFAULT_TTL / 2))
+# One tenure per lookback window used by fetch_real_return (1Y / 3Y / 5Y)
+WARM_TENURES = (1, 5, 10)
+
+
+class MarketDataRefresher:
+    """
+    Background warm-up and refresh of every SCHEME_MAP scheme.
+
+    The first pass loads (or downloads) each NAV history and the scheme
+    search index and computes the CAGRs the planner asks for, so the first
+    visitor after a restart is served from memory. Later passes re-sync the histories every `interval`
+    seconds on the same daemon thread while requests keep reading the
+    current copy.
+    """
+
+    def __init__(self, store=None, categories=None, interval=REFRESH_INTERVAL):
+        self.store = store or default_store()
+        self.categories = list(categories) if categories else None
+        self.interval = interval
+        self.ready = threading.Event()
+        self.runs = 0
+        self.errors = 0
+        self.last_run = None
+        self.last_duration = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """
+        One warm-up / refresh pass. Returns the number of schemes that failed.
+        """
+        # The engines (and NumPy) load here, on the refresher thread, so
+        # starting the warm-up does not delay a page's first paint
+        from .data_fetcher import SCHEME_MAP, fetch_real_returns, scheme_code
+        from .scheme_index import loaded_scheme_index, scheme_index
+
+        started = time.perf_counter()
+        if self.categories is None:
+            self.categories = list(SCHEME_MAP)
+        codes = [scheme_code(cat) for cat in self.categories]
+        refresh = self.store.refresh if self.ready.is_set() else self.store.get
+
+        def attempt(code):
+            try:
+                refresh(code)
+                return 0
+            except Exception:
+                return 1
+
+        with ThreadPoolExecutor(max_workers=len(codes) + 1) as pool:
+            # The scheme list is loaded once per process, retried on later passes if it failed
+            index = None if loaded_scheme_index() is not None else pool.submit(scheme_index)
+            failed = sum(pool.map(attempt, codes))
+            if index is not None and index.exception() is not None:
+                failed += 1
+        # Computes and records the CAGRs from memory; no network calls left to make
+        for tenure in WARM_TENURES:
+            fetch_real_returns(self.categories, tenure)
+
+        self.runs += 1
+        self.errors += failed
+        self.last_run = time.time()
+        self.last_duration = time.perf_counter() - started
+        self.ready.set()
+        return failed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="market-data-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            "ready": self.ready.is_set(),
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run": self.last_run,
+            "last_duration_s": self.last_duration,
+            "interval_s": self.interval,
+        }
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_warmup(interval=REFRESH_INTERVAL):
+    """
+    Starts the process-wide refresher once; later calls (every Streamlit
+    rerun, every page) return the running instance. Also switches the
+    default store to stale-while-revalidate so no request blocks on a refresh.
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            store = default_store()
+            store.background_refresh = True
+            _refresher = MarketDataRefresher(store, interval=interval).start()
+        return _refresher
+
+
+def warmup_status():
+    return _refresher.status() if _refresher is not None else None
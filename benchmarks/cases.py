@@ -0,0 +1,232 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from SIP.finance import data_fetcher, metrics, nav_store
+from SIP.finance.backtest import backtest_portfolio
+from SIP.finance.circuit import CircuitBreaker
+from SIP.finance.data_fetcher import SCHEME_MAP, fetch_real_return
+from SIP.finance.loan_engine import simulate_stepup_loan, sweep_stepup
+from SIP.finance.mfapi_stream import parse_payload
+from SIP.finance.nav_series import NavSeries
+from SIP.finance.portfolio import simulate_portfolio, simulate_portfolio_batch
+from SIP.finance.scheme_index import SchemeIndex
+from SIP.finance.sip_engine import calculate_fund_growth, fund_growth_curve
+from SIP.finance.formatting import format_currency, format_currency_array
+
+from .fixtures import load_payload, synthetic_scheme_list
+from .stub_server import StubMfapiServer
+
+TENURES = (1, 5, 10, 25, 50)
+QUICK_TENURES = (1, 15, 50)
+
+
+class Case:
+    """
+    One benchmark: a zero-argument callable plus the parameters it was built with.
+    `setup` / `teardown` run once around the timing loop.
+    """
+
+    def __init__(self, name, params, fn, setup=None, teardown=None):
+        self.name = name
+        self.params = params
+        self.fn = fn
+        self.setup = setup
+        self.teardown = teardown
+
+    @property
+    def key(self):
+        args = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{args}]"
+
+
+def _funds(n):
+    rng = np.random.default_rng(n)
+    alloc = rng.dirichlet(np.ones(n)) * 100
+    return [{"name": f"Fund {i}", "allocation_pct": float(a), "return_pct": float(r)}
+            for i, (a, r) in enumerate(zip(alloc, rng.uniform(6, 20, n)))]
+
+
+def sip_cases(quick):
+    for years in (QUICK_TENURES if quick else TENURES):
+        yield Case("calculate_fund_growth", {"years": years},
+                   lambda years=years: calculate_fund_growth(20000, years, 10, 12.5))
+    for batch in ((1, 1000) if quick else (1, 100, 1000, 10000)):
+        returns = np.linspace(5, 20, batch)
+        yield Case("fund_growth_curve", {"years": 50, "batch": batch},
+                   lambda returns=returns: fund_growth_curve(20000, 50, 10, returns))
+
+
+def portfolio_cases(quick):
+    for n_funds in ((6,) if quick else (1, 3, 6, 12)):
+        for years in (QUICK_TENURES if quick else TENURES):
+            funds = _funds(n_funds)
+            yield Case("simulate_portfolio", {"funds": n_funds, "years": years},
+                       lambda funds=funds, years=years: simulate_portfolio(20000, years, 10, funds))
+    returns = [7.0, 9.5, 12.5, 14.5, 17.0, 19.0]
+    for batch in ((1000,) if quick else (100, 1000, 10000)):
+        allocations = np.random.default_rng(batch).dirichlet(np.ones(6), batch) * 100
+        yield Case("simulate_portfolio_batch", {"portfolios": batch, "years": 30},
+                   lambda a=allocations: simulate_portfolio_batch(20000, 30, 10, a, returns, per_fund=False))
+    result = simulate_portfolio_batch(20000, 30, 10, [20, 20, 15, 15, 15, 15], returns)
+    yield Case("portfolio_to_frame", {"years": 30}, result.to_frame)
+
+
+def loan_cases(quick):
+    for months in ((240,) if quick else (60, 240, 600)):
+        yield Case("simulate_stepup_loan", {"months": months},
+                   lambda months=months: simulate_stepup_loan(2225354, 8.1, 21047, 10000, 10, 50, 12, months))
+    result = simulate_stepup_loan(2225354, 8.1, 21047, 10000, 10, 50, 12)
+    yield Case("loan_to_frame", {"months": 240}, result.to_frame)
+    for size in ((11,) if quick else (5, 11, 21)):
+        axes = (np.linspace(0, 100, size), np.linspace(0, 20, size), np.linspace(7, 12, size), np.linspace(8, 18, size))
+        yield Case("sweep_stepup", {"grid": f"{size}^4"},
+                   lambda axes=axes: sweep_stepup(2225354, 21047, 10000, *axes))
+
+
+def format_cases(quick):
+    for rows in ((10000,) if quick else (1000, 10000, 100000)):
+        column = np.random.default_rng(rows).uniform(0, 5e7, rows).tolist()
+        yield Case("format_currency_column", {"rows": rows},
+                   lambda column=column: [format_currency(v) for v in column])
+        array = np.asarray(column)
+        yield Case("format_currency_array", {"rows": rows},
+                   lambda array=array: format_currency_array(array))
+        yield Case("format_currency_array", {"rows": rows, "short": True},
+                   lambda array=array: format_currency_array(array, short=True))
+
+
+def backtest_cases(quick):
+    """
+    Every historical start date x all SCHEME_MAP funds, on the fixture histories.
+    """
+    series = []
+    for code in SCHEME_MAP.values():
+        dates, navs = parse_payload(json.dumps(load_payload(code)).encode())
+        series.append(NavSeries(np.frombuffer(dates, dtype=np.int32), np.frombuffer(navs), code))
+    for years in ((10,) if quick else (3, 10, 15)):
+        yield Case("backtest_portfolio", {"funds": len(series), "years": years},
+                   lambda years=years: backtest_portfolio(series, [5000] * len(series), years, 10))
+
+
+def search_cases(quick):
+    """
+    Scheme index over a synthetic list the size of mfapi.in's: build once,
+    then as-you-type lookups (prefix, fuzzy, filtered, very broad).
+    """
+    schemes = synthetic_scheme_list()
+    yield Case("scheme_index_build", {"schemes": len(schemes)}, lambda: SchemeIndex.from_list(schemes))
+    index = SchemeIndex.from_list(schemes)
+    queries = [("prefix", "hdfc mid dir", {}), ("fuzzy", "nipon smal", {}),
+               ("filtered", "", {"amc": "SBI", "category": "Liquid", "plan": "Direct"}), ("broad", "fund", {})]
+    for kind, query, filters in (queries[:2] if quick else queries):
+        yield Case("scheme_search", {"query": kind},
+                   lambda query=query, filters=filters: index.search(query, 20, **filters))
+
+
+def metrics_cases(quick):
+    """
+    Instrumentation overhead: the same timed call with recording off and on.
+    """
+    funds = _funds(6)
+    was_enabled = metrics.enabled()
+
+    def recording(on):
+        return lambda: metrics.enable(on)
+
+    def restore():
+        metrics.enable(was_enabled)
+        metrics.reset()
+
+    for on in (False, True):
+        yield Case("simulate_portfolio", {"funds": 6, "years": 15, "metrics": on},
+                   lambda: simulate_portfolio(20000, 15, 10, funds), setup=recording(on), teardown=restore)
+        yield Case("timer", {"metrics": on},
+                   lambda: metrics.timer("bench").__exit__(None, None, None), setup=recording(on), teardown=restore)
+
+
+def fetch_cases(quick):
+    """
+    fetch_real_return against a local stub of mfapi.in: cold (empty store),
+    incremental (TTL expired, nothing new upstream) and warm (served from memory).
+    """
+    state = {}
+    code = SCHEME_MAP["Nifty 50"]
+
+    def start():
+        state["server"] = StubMfapiServer().__enter__()
+        state["root"] = tempfile.mkdtemp(prefix="arthaflow-bench-")
+        state["previous"] = nav_store.default_store()
+
+    def use_store(ttl):
+        store = nav_store.NavStore(root=state["root"], ttl=ttl, api_url=state["server"].api_url,
+                                   breaker=CircuitBreaker("bench", failure_threshold=10**9))
+        nav_store.set_default_store(store)
+        return store
+
+    def stop():
+        nav_store.set_default_store(state["previous"])
+        state["server"].__exit__(None, None, None)
+        shutil.rmtree(state["root"], ignore_errors=True)
+
+    def cold():
+        store = use_store(ttl=3600)
+        try:
+            os.remove(store.path_for(code))
+        except FileNotFoundError:
+            pass
+        return fetch_real_return("Nifty 50", 15)
+
+    def cold_batch():
+        # Fresh directory per call so every scheme is downloaded again
+        use_store(ttl=3600).root = tempfile.mkdtemp(dir=state["root"])
+        return data_fetcher.fetch_real_returns(list(SCHEME_MAP), 15)
+
+    def prime(ttl):
+        def setup():
+            start()
+            use_store(ttl).get(code)
+        return setup
+
+    payload = json.dumps(load_payload(code), separators=(",", ":")).encode()
+    yield Case("parse_payload", {"rows": payload.count(b'"date"')}, lambda: parse_payload(payload))
+    yield Case("fetch_real_return", {"store": "cold"}, cold, setup=start, teardown=stop)
+    yield Case("fetch_real_return", {"store": "incremental"},
+               lambda: fetch_real_return("Nifty 50", 15), setup=prime(0), teardown=stop)
+    yield Case("fetch_real_return", {"store": "warm"},
+               lambda: fetch_real_return("Nifty 50", 15), setup=prime(3600), teardown=stop)
+    yield Case("fetch_real_returns", {"store": "cold", "schemes": len(SCHEME_MAP)},
+               cold_batch, setup=start, teardown=stop)
+
+
+def startup_cases(quick):
+    """
+    Cold import of each entry point in a fresh interpreter, as a new
+    Streamlit worker pays it. "-" is the bare interpreter, for reference.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    modules = ("-", "warmup", "portfolio") if quick else \
+        ("-", "metrics", "warmup", "portfolio", "loan_engine", "data_fetcher", "scheme_index", "batch")
+    for module in modules:
+        code = "pass" if module == "-" else f"import SIP.finance.{module}"
+        yield Case("cold_import", {"module": module},
+                   lambda code=code: subprocess.run([sys.executable, "-c", code], env=env, check=True))
+
+
+SUITES = {
+    "sip": sip_cases,
+    "portfolio": portfolio_cases,
+    "loan": loan_cases,
+    "format": format_cases,
+    "backtest": backtest_cases,
+    "search": search_cases,
+    "metrics": metrics_cases,
+    "fetch": fetch_cases,
+    "startup": startup_cases,
+}
@@ -0,0 +1,69 @@
+import gzip
+import json
+import os
+import random
+from datetime import date, timedelta
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture_path(code):
+    return os.path.join(FIXTURE_DIR, f"{code}.json.gz")
+
+
+def synthetic_payload(code, start=date(2006, 4, 3), end=date(2025, 12, 31)):
+    """
+    mfapi.in-shaped payload with a seeded random walk over weekdays.
+    Used when no recording exists for `code`, so the suite always runs offline.
+    """
+    rng = random.Random(int(code))
+    rows, nav, day = [], 10.0, start
+    while day <= end:
+        if day.weekday() < 5:
+            nav *= 1 + rng.gauss(0.0005, 0.011)
+            rows.append({"date": day.strftime("%d-%m-%Y"), "nav": f"{nav:.5f}"})
+        day += timedelta(days=1)
+    rows.reverse()  # mfapi.in lists the newest NAV first
+    return {
+        "meta": {"scheme_code": int(code), "scheme_name": f"Synthetic Scheme {code}"},
+        "data": rows,
+        "status": "SUCCESS",
+    }
+
+
+def load_payload(code):
+    """
+    Recorded payload for `code` if one was captured with record_fixtures,
+    otherwise a synthetic one.
+    """
+    path = fixture_path(code)
+    if os.path.exists(path):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+    return synthetic_payload(code)
+
+
+def synthetic_scheme_list(n=40000, seed=7):
+    """
+    mfapi.in /mf-shaped scheme list with realistic name structure
+    (fund house, strategy, plan, option), about the size of the real one.
+    """
+    rng = random.Random(seed)
+    houses = ["Aditya Birla Sun Life", "Axis", "Bandhan", "DSP", "Franklin India", "HDFC", "ICICI Prudential",
+              "Kotak", "Mirae Asset", "Motilal Oswal", "Nippon India", "Parag Parikh", "Quant", "SBI",
+              "Sundaram", "Tata", "UTI", "Edelweiss", "Invesco India", "Canara Robeco"]
+    strategies = ["Small Cap Fund", "Mid Cap Fund", "Flexi Cap Fund", "Large Cap Fund", "Large & Mid Cap Fund",
+                  "Nifty 50 Index Fund", "Nifty Midcap 150 Index Fund", "Liquid Fund", "Overnight Fund",
+                  "Banking & PSU Debt Fund", "Corporate Bond Fund", "Gilt Fund", "Gold ETF", "Gold Fund of Fund",
+                  "ELSS Tax Saver Fund", "Balanced Advantage Fund", "Arbitrage Fund", "Pharma & Healthcare Fund",
+                  "Infrastructure Fund", "Fixed Maturity Plan Series", "Short Duration Fund", "Value Fund"]
+    plans = ["Direct Plan", "Regular Plan"]
+    options = ["Growth", "IDCW Payout", "IDCW Reinvestment", "Growth Option"]
+    schemes = []
+    for i in range(n):
+        name = f"{rng.choice(houses)} {rng.choice(strategies)}"
+        if rng.random() < 0.3:
+            name += f" {rng.randint(1, 99)}"
+        name += f" - {rng.choice(plans)} - {rng.choice(options)}"
+        schemes.append({"schemeCode": 100000 + i, "schemeName": name})
+    return schemes
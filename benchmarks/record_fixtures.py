@@ -0,0 +1,29 @@
+"""
+Records live mfapi.in payloads for every SCHEME_MAP scheme into
+benchmarks/fixtures/<code>.json.gz. Run once while online:
+
+    python -m benchmarks.record_fixtures
+"""
+import gzip
+import json
+import os
+
+import requests
+
+from SIP.finance.data_fetcher import SCHEME_MAP
+from SIP.finance.nav_store import API_URL
+
+from .fixtures import FIXTURE_DIR, fixture_path
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for category, code in SCHEME_MAP.items():
+        payload = requests.get(API_URL.format(code=code), timeout=30).json()
+        with gzip.open(fixture_path(code), "wt", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        print(f"{category}: {len(payload['data'])} rows -> {fixture_path(code)}")
+
+
+if __name__ == "__main__":
+    main()
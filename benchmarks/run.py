@@ -0,0 +1,121 @@
+"""
+Benchmark runner for the finance engines. Runs fully offline.
+
+    python -m benchmarks                                  # full suite, table only
+    python -m benchmarks --quick --output bench.json      # smaller grid, save results
+    python -m benchmarks --baseline bench.json            # exit 1 on slowdowns
+    python -m benchmarks --suite sip --suite loan         # selected suites
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from .cases import SUITES
+
+
+def measure(fn, min_time=0.05, repeat=5):
+    """
+    timeit-style measurement: picks a loop count that runs for at least
+    `min_time`, then reports per-call seconds over `repeat` rounds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10**6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(suites, quick=False, min_time=0.05, repeat=5):
+    results = []
+    for suite in suites:
+        for case in SUITES[suite](quick):
+            if case.setup:
+                case.setup()
+            try:
+                stats = measure(case.fn, min_time, repeat)
+            finally:
+                if case.teardown:
+                    case.teardown()
+            results.append(dict(suite=suite, name=case.name, params=case.params, key=case.key, **stats))
+            print(f"{case.key:<60} {stats['median_s'] * 1e3:>12.4f} ms", flush=True)
+    return results
+
+
+def compare(results, baseline, max_slowdown):
+    """
+    Returns (key, baseline_s, current_s, ratio) for every case slower than
+    `max_slowdown` times its baseline median.
+    """
+    previous = {r["key"]: r["median_s"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result["key"])
+        if before and result["median_s"] / before > max_slowdown:
+            regressions.append((result["key"], before, result["median_s"], result["median_s"] / before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run (repeatable, default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller parameter grid")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail when median time exceeds baseline by this factor (default 1.25)")
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.suite or list(SUITES), args.quick, args.min_time, args.repeat)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.max_slowdown)
+        for key, before, after, ratio in regressions:
+            print(f"SLOWER  {key}: {before * 1e3:.4f} ms -> {after * 1e3:.4f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
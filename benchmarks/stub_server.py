@@ -0,0 +1,82 @@
+import bisect
+import json
+import re
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .fixtures import load_payload
+
+_SCHEME_PATH = re.compile(r"^/mf/(\d+)$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every small keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        match = _SCHEME_PATH.match(url.path)
+        if not match:
+            self.send_error(404)
+            return
+        body = self.server.render(match.group(1), parse_qs(url.query))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubMfapiServer(ThreadingHTTPServer):
+    """
+    Local stand-in for api.mfapi.in that replays fixture payloads,
+    honouring the startDate filter used for incremental syncs.
+
+        with StubMfapiServer() as server:
+            store = NavStore(api_url=server.api_url, ...)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self._payloads = {}
+        self._bodies = {}
+        self._ordinals = {}
+        self.requests = 0
+
+    @property
+    def api_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/mf/{{code}}"
+
+    def render(self, code, query):
+        self.requests += 1
+        if code not in self._payloads:
+            payload = load_payload(code)
+            self._payloads[code] = payload
+            # Negated ordinals of the newest-first rows are ascending, so bisect works
+            self._ordinals[code] = [-date(*map(int, reversed(row["date"].split("-")))).toordinal()
+                                    for row in payload["data"]]
+        start = query.get("startDate", [None])[0]
+        if start is None:
+            if code not in self._bodies:
+                self._bodies[code] = json.dumps(self._payloads[code]).encode()
+            return self._bodies[code]
+        cut = bisect.bisect_right(self._ordinals[code], -date.fromisoformat(start).toordinal())
+        return json.dumps(dict(self._payloads[code], data=self._payloads[code]["data"][:cut])).encode()
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
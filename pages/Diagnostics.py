@@ -0,0 +1,92 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from SIP.finance import metrics
+from SIP.finance.data_fetcher import degraded_categories
+from SIP.finance.warmup import warmup_status
+
+st.set_page_config(page_title="ArthaFlow Diagnostics", layout="wide")
+
+st.title("🩺 Diagnostics")
+st.caption("Per-stage timings, cache hit rates and MFAPI.in latency for this server process.")
+
+# --- CONTROLS ---
+c1, c2, c3 = st.columns([1, 1, 2])
+recording = c1.toggle("Record Metrics", value=metrics.enabled(),
+                      help="Set ARTHAFLOW_METRICS=1 to record from startup.")
+if recording != metrics.enabled():
+    metrics.enable(recording)
+if c2.button("Reset"):
+    metrics.reset()
+if metrics.METRICS_FILE:
+    c3.caption(f"Prometheus file: `{metrics.METRICS_FILE}` (every {metrics.EXPORT_INTERVAL:g}s)")
+
+snap = metrics.snapshot()
+
+# --- STAGE TIMINGS ---
+st.subheader("Stage Timings")
+histograms = [h for h in snap["histograms"] if h["count"]]
+if histograms:
+    rows = [{
+        "Metric": h["name"],
+        "Labels": ", ".join(f"{k}={v}" for k, v in h["labels"].items()),
+        "Count": h["count"],
+        "Mean (ms)": h["mean"] * 1000,
+        "p50 (ms)": h["p50"] * 1000,
+        "p99 (ms)": h["p99"] * 1000,
+    } for h in histograms]
+    st.dataframe(pd.DataFrame(rows).style.format("{:.2f}", subset=["Mean (ms)", "p50 (ms)", "p99 (ms)"]),
+                 use_container_width=True, hide_index=True)
+    st.caption("p50 / p99 are estimated from the latency buckets, as Prometheus does.")
+elif metrics.enabled():
+    st.info("Recording. Use the planner pages and come back to see timings.")
+else:
+    st.info("Metrics are off. Turn on recording above to collect timings.")
+
+if snap["counters"]:
+    st.dataframe(pd.DataFrame([{
+        "Counter": c["name"],
+        "Labels": ", ".join(f"{k}={v}" for k, v in c["labels"].items()),
+        "Value": c["value"],
+    } for c in snap["counters"]]), use_container_width=True, hide_index=True)
+
+# --- STARTUP ---
+if snap["startup"]:
+    st.subheader("Cold Start")
+    startup = pd.DataFrame(snap["startup"]).pivot(index="page", columns="phase", values="seconds") * 1000
+    st.dataframe(startup.rename(columns=lambda phase: f"{phase} (ms)").style.format("{:.0f}", na_rep="—"),
+                 use_container_width=True)
+    st.caption("Milliseconds from this process first importing SIP.finance to each page's first run "
+               "finishing its imports and its script.")
+
+# --- CACHES ---
+st.subheader("Memoization Caches")
+if snap["caches"]:
+    st.dataframe(pd.DataFrame([{
+        "Cache": name, "Hits": info["hits"], "Misses": info["misses"],
+        "Hit Rate": info["hit_rate"] * 100, "Entries": info["currsize"],
+        "Size (MB)": info["nbytes"] / 2**20,
+    } for name, info in snap["caches"].items()]).style.format(
+        {"Hit Rate": "{:.1f}%", "Size (MB)": "{:.2f}"}), use_container_width=True, hide_index=True)
+
+# --- MARKET DATA ---
+st.subheader("Market Data")
+status = warmup_status()
+if status is None:
+    st.info("Background refresher not started in this process.")
+else:
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Warm", "Yes" if status["ready"] else "Loading")
+    m2.metric("Refresh Passes", status["runs"])
+    m3.metric("Failed Fetches", status["errors"])
+    if status["last_run"]:
+        m4.metric("Last Refresh", f"{(time.time() - status['last_run']) / 60:.0f} min ago",
+                  help=f"Took {status['last_duration_s']:.1f}s")
+degraded = degraded_categories()
+if degraded:
+    st.warning("Not served live: " + ", ".join(f"{cat} ({kind})" for cat, kind in degraded.items()))
+
+with st.expander("Prometheus Exposition"):
+    st.code(metrics.render_prometheus(), language="text")
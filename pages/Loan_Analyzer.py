@@ -1,23 +1,15 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-
-# --- INDIAN CURRENCY FORMATTER ---
-def format_indian(number):
-    s = f"{round(number):,}"
-    parts = s.split(",")
-    if len(parts) <= 2: return "₹ " + s
-    else:
-        last_three = parts[-1]
-        other_parts = "".join(parts[:-1])
-        res = ""
-        n = len(other_parts)
-        for i in range(n):
-            if i > 0 and (n - i) % 2 == 0: res += ","
-            res += other_parts[i]
-        return "₹ " + res + "," + last_three
+
+from SIP.finance.loan_engine import simulate_stepup_loan_cached as simulate_stepup_loan
+from SIP.finance.loan_engine import sweep_stepup_cached as sweep_stepup
+from SIP.finance.downsample import chart_series
+from SIP.finance.formatting import format_currency, format_currency_array, format_frame
+from SIP.finance.metrics import mark_startup, stopwatch, timed, timer
+
+mark_startup("loan_analyzer", "imports")
 
 st.set_page_config(page_title="Loan Step-Up Planner", layout="wide")
+rerun_timer = stopwatch("page_rerun", page="loan_analyzer")
 
 # --- SIDEBAR: THE EDUCATION HUB ---
 with st.sidebar:
@@ -72,61 +64,86 @@ with st.container():
         split_ratio = st.select_slider("Split (Prepay% : SIP%)", options=[0, 20, 40, 50, 60, 80, 100], value=50)
 
 # Calculations
-def get_stepup_data():
-    data = []
-    curr_loan, curr_sip = loan_bal, 0
-    current_monthly_cont = initial_cont
-    intersect_m = None
-    
-    for m in range(1, 241):
-        # Annual Step-Up Logic: Every 12 months, increase the contribution
-        if m > 1 and (m - 1) % 12 == 0:
-            current_monthly_cont *= (1 + (step_up_pct / 100))
-        
-        m_prepay = (current_monthly_cont * split_ratio) / 100
-        m_sip = current_monthly_cont - m_prepay
-        
-        # Loan Math
-        interest = curr_loan * (rate / 100 / 12)
-        principal = (emi - interest) + m_prepay
-        curr_loan = max(0, curr_loan - principal)
-        
-        # SIP Math
-        curr_sip = (curr_sip + m_sip) * (1 + (sip_return / 100 / 12))
-        
-        data.append({"Month": m, "Loan": curr_loan, "SIP": curr_sip, "Monthly_Cont": current_monthly_cont})
-        
-        if curr_sip >= curr_loan and intersect_m is None and curr_loan > 0:
-            intersect_m = m
-            
-    return pd.DataFrame(data), intersect_m
-
-df, intersect = get_stepup_data()
+with timer("simulate_stepup_loan"):
+    result = simulate_stepup_loan(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return)
+    df, intersect = result.to_frame(), result.intersect_month
 
 # Section 2: Visual Results
 st.markdown("---")
 r1, r2, r3 = st.columns(3)
 if intersect:
     r1.metric("Freedom Date", f"{intersect // 12}y {intersect % 12}m")
-    r2.metric("Final SIP Value", format_indian(df.iloc[intersect-1]['SIP']))
+    r2.metric("Final SIP Value", format_currency(df.iloc[intersect-1]['SIP'], symbol="₹ "))
     # Calculating end contribution to show growth
     end_cont = df.iloc[intersect-1]['Monthly_Cont']
-    r3.metric("Final Monthly Contribution", format_indian(end_cont))
+    r3.metric("Final Monthly Contribution", format_currency(end_cont, symbol="₹ "))
 
 # The Visualization
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=df['Month'], y=df['Loan'], name="Debt (Loan)", line=dict(color='#FF4B4B', width=3)))
-fig.add_trace(go.Scatter(x=df['Month'], y=df['SIP'], name="Wealth (SIP)", line=dict(color='#00CC96', width=3)))
-if intersect:
-    fig.add_vline(x=intersect, line_dash="dash", line_color="orange")
+# Downsampled server-side; the freedom and payoff months are always plotted
+with timer("render_loan_chart"):
+    # Plotly loads here, after the inputs and metrics above are already on screen
+    import plotly.graph_objects as go
+
+    key_months = [m - 1 for m in (intersect, result.payoff_month) if m]
+    lines = chart_series(result.month, {"Loan": result.loan, "SIP": result.sip}, keep=key_months)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=lines["Loan"][0], y=lines["Loan"][1], name="Debt (Loan)", line=dict(color='#FF4B4B', width=3)))
+    fig.add_trace(go.Scatter(x=lines["SIP"][0], y=lines["SIP"][1], name="Wealth (SIP)", line=dict(color='#00CC96', width=3)))
+    if intersect:
+        fig.add_vline(x=intersect, line_dash="dash", line_color="orange")
+
+    fig.update_layout(title="The Impact of Stepping Up Your Contribution", hovermode="x unified")
+    st.plotly_chart(fig, use_container_width=True)
 
-fig.update_layout(title="The Impact of Stepping Up Your Contribution", hovermode="x unified")
-st.plotly_chart(fig, use_container_width=True)
+# Section 3: Strategy Heatmap (every split x step-up combination in one batched sweep)
+st.markdown("---")
+st.subheader("2. Strategy Heatmap")
+
+@st.fragment
+@timed("fragment_heatmap")
+def strategy_heatmap(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return):
+    # Switching the view reruns only this section; the loan chart above is not redrawn
+    split_options = list(range(0, 101, 10))
+    step_options = list(range(0, 21))
+    with timer("sweep_stepup"):
+        sweep = sweep_stepup(loan_bal, emi, initial_cont, split_options, step_options, [rate], [sip_return])
+    view = st.radio("Show", ["Freedom Date (Months)", "Net Worth at 20 Years"], horizontal=True)
+    if view == "Freedom Date (Months)":
+        z = sweep.surface("freedom_month").astype(float)
+        z[z == 0] = float("nan")  # SIP never overtakes the loan within 20 years
+        colorscale, colorbar_title = "RdYlGn_r", "Months"
+        hover_text = format_currency_array(z, symbol="")
+    else:
+        z = sweep.surface("final_net_worth")
+        colorscale, colorbar_title = "RdYlGn", "₹"
+        hover_text = format_currency_array(z, short=True)  # lakhs / crores
+
+    with timer("render_heatmap"):
+        import plotly.graph_objects as go
+
+        heat = go.Figure(go.Heatmap(
+            z=z, x=step_options, y=split_options, colorscale=colorscale,
+            colorbar=dict(title=colorbar_title), customdata=hover_text,
+            hovertemplate="Step-Up: %{x}%<br>Prepay: %{y}%<br>Value: %{customdata}<extra></extra>"
+        ))
+        heat.add_trace(go.Scatter(
+            x=[step_up_pct], y=[split_ratio], mode="markers", name="Your Plan",
+            marker=dict(symbol="x", size=14, color="black")
+        ))
+        heat.update_layout(
+            title=f"{view} at {rate}% Loan Rate and {sip_return}% SIP Return",
+            xaxis_title="Annual Step-Up (%)", yaxis_title="Prepay Share of Contribution (%)",
+            showlegend=False
+        )
+        st.plotly_chart(heat, use_container_width=True)
+
+strategy_heatmap(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return)
 
 # Data Table
 with st.expander("View Month-by-Month Growth & Step-Up Schedule"):
-    st.dataframe(df.style.format({
-        "Loan": lambda x: format_indian(x),
-        "SIP": lambda x: format_indian(x),
-        "Monthly_Cont": lambda x: format_indian(x)
-    }))
\ No newline at end of file
+    # Whole columns are formatted in one vectorized pass instead of per-cell Styler callbacks
+    with timer("build_schedule_table"):
+        st.dataframe(format_frame(df, ["Loan", "SIP", "Monthly_Cont"], symbol="₹ "))
+
+rerun_timer.stop()
+mark_startup("loan_analyzer", "first_paint")
@@ -1,33 +1,33 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import numpy as np
 from datetime import datetime
-import sys
-import os
-from pathlib import Path
-
-# --- DIRECTORY FIX FOR MULTIPAGE STRUCTURE ---
-# This allows the script to find the 'SIP' folder from within the 'pages' folder
-root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
-
-# Note: Ensure your local finance module is in the same directory or PYTHONPATH
-try:
-    # Updated imports to reference the SIP folder package
-    from SIP.finance.portfolio import simulate_portfolio
-    from SIP.finance.utils import format_currency
-    from SIP.finance.data_fetcher import fetch_real_return
-except ImportError:
-    # Fallback functions for demonstration if local modules aren't found
-    def format_currency(val): return f"₹{val:,.0f}"
-    def fetch_real_return(cat, tenure): return 12.0, tenure
-    def simulate_portfolio(sip, ten, step, funds):
-        total_inv = sip * 12 * ten # Simplistic fallback
-        return [sip * 100] * (ten * 12), [{"name": f["name"], "final_value": 100000} for f in funds], total_inv
+
+# pandas and Plotly are imported where a section first draws a table or chart,
+# so they load after the page's first elements are on screen
+from SIP.finance.portfolio import IncrementalPortfolio
+from SIP.finance.formatting import format_currency, format_currency_array
+from SIP.finance.data_fetcher import fetch_real_returns, degraded_categories, fetch_rolling_returns
+from SIP.finance.data_fetcher import SCHEME_MAP
+from SIP.finance.scheme_index import loaded_scheme_index, scheme_index
+from SIP.finance.nav_series import return_distribution, to_datetime64
+from SIP.finance.monte_carlo import load_monthly_returns, run_monte_carlo
+from SIP.finance.backtest import backtest_categories
+from SIP.finance.downsample import chart_series
+from SIP.finance.warmup import start_warmup
+from SIP.finance.metrics import mark_startup, start_exporter, stopwatch, timed, timer
+from SIP.finance.goal_seek import required_sip, required_step_up, required_tenure
+
+mark_startup("sip_planner", "imports")
 
 # UI Setup
 st.set_page_config(page_title="ArthaFlow SIP Planner", layout="wide", initial_sidebar_state="expanded")
 
+# No-op after the first run; covers deployments that open this page directly
+start_warmup()
+start_exporter()
+# Full script runs only; fragment reruns are timed per fragment
+rerun_timer = stopwatch("page_rerun", page="sip_planner")
+
 # --- CUSTOM CSS ---
 st.markdown("""
     <style>
@@ -85,30 +85,36 @@ st.markdown("""
 # --- SIDEBAR: DATA TRANSPARENCY ---
 with st.sidebar:
     st.title("🔍 Data Transparency")
-    st.markdown("""
-    ### Source: MFAPI.in
-    We use real-time market data to calculate **CAGR (Compound Annual Growth Rate)** based on historical NAVs.
-    
-    **Fund Mappings:**
-    - **Debt MF:** Liquid/Overnight Funds
-    - **Gold ETF:** Nippon India Gold BeES
-    - **Nifty 50:** UTI Nifty 50 Index Fund
-    - **Flexi Cap:** Parag Parikh Flexi Cap
-    - **Mid Cap:** HDFC Mid-Cap Opportunities
-    - **Small Cap:** Nippon India Small Cap
-    
-    *Returns are calculated using the requested tenure or the maximum available history.*
-    """)
+    # Generated from SCHEME_MAP so the listed funds are the ones actually fetched.
+    # Names come from the mfapi.in scheme list once the warm-up has loaded it.
+    index = loaded_scheme_index()
+    mappings = "\n".join(
+        f"- **{cat}:** {index.name_of(code, 'Scheme')} (`{code}`)" if index else f"- **{cat}:** Scheme `{code}`"
+        for cat, code in SCHEME_MAP.items()
+    )
+    st.markdown(f"""
+### Source: MFAPI.in
+We use real-time market data to calculate **CAGR (Compound Annual Growth Rate)** based on historical NAVs.
+
+**Fund Mappings:**
+{mappings}
+
+*Returns are calculated using the requested tenure or the maximum available history.*
+""")
     st.divider()
     st.info("**⚠️ Disclaimer:** Simulations use historical averages. Past performance does not guarantee future returns.")
 
 # --- STATE MANAGEMENT ---
+CATEGORIES = ["Debt MF", "Gold ETF", "Nifty 50", "Flexi Cap", "Mid Cap", "Small Cap"]
+
 if 'selected_profile' not in st.session_state:
     st.session_state.update({
         "Debt MF": 30, "Gold ETF": 10, "Nifty 50": 30, 
         "Flexi Cap": 20, "Mid Cap": 5, "Small Cap": 5,
         "selected_profile": "Balanced"
     })
+# Funds the user picked from the scheme index: [{"code", "name"}]
+st.session_state.setdefault("custom_funds", [])
 
 def select_profile(name, d, g, n, f, m, s):
     st.session_state.update({
@@ -116,11 +122,370 @@ def select_profile(name, d, g, n, f, m, s):
         "Flexi Cap": f, "Mid Cap": m, "Small Cap": s,
         "selected_profile": name
     })
+    # Profiles cover the core categories only
+    for fund in st.session_state.custom_funds:
+        st.session_state[f"in_{fund['code']}"] = 0
+
+def run_portfolio(sip, years, step, funds):
+    # Keep one engine per session so editing a single allocation is one vector update
+    engine = st.session_state.get("portfolio_engine")
+    if engine is None or not engine.matches(sip, years, step):
+        engine = IncrementalPortfolio(sip, years, step, funds)
+        st.session_state.portfolio_engine = engine
+    else:
+        engine.sync(funds)
+    return engine.combined, engine.fund_results(), engine.total_invested
+
+# --- FRAGMENTS ---
+# Each section below reruns on its own when one of its widgets changes.
+# Everything it reads is passed in explicitly, so a fragment rerun replays it
+# with the values from the enclosing run instead of rerunning the page.
+
+@st.fragment
+@timed("fragment_fund_picker")
+def fund_picker_section():
+    """
+    Search over every scheme on mfapi.in. Typing and filtering rerun only
+    this section; adding or removing a fund reruns the page, because the
+    live returns fetched for the page depend on the fund list.
+    """
+    with st.expander("🔎 Add Any Mutual Fund", expanded=bool(st.session_state.custom_funds)):
+        try:
+            with st.spinner("Loading the scheme list..."):
+                index = scheme_index()
+        except Exception:
+            st.info("The MFAPI.in scheme list is unavailable right now. Please try again later.")
+            return
+
+        q1, q2, q3, q4 = st.columns([3, 2, 2, 1])
+        query = q1.text_input("Search Schemes", placeholder="e.g. parag flexi, hdfc mid dir")
+        amc = q2.selectbox("Fund House", ["All"] + index.amcs())
+        category = q3.selectbox("Category", ["All"] + index.categories())
+        direct_growth = q4.toggle("Direct Growth", value=True)
+        filters = {"amc": None if amc == "All" else amc, "category": None if category == "All" else category}
+        if direct_growth:
+            filters.update(plan="Direct", option="Growth")
+
+        results = index.search(query, limit=50, **filters) if (query or amc != "All" or category != "All") else []
+        chosen = {f["code"] for f in st.session_state.custom_funds} | set(SCHEME_MAP.values())
+        results = [r for r in results if r["code"] not in chosen]
+        if results:
+            r1, r2 = st.columns([5, 1])
+            pick = r1.selectbox("Matches", results, format_func=lambda r: f"{r['name']} · {r['category']}",
+                                label_visibility="collapsed")
+            if r2.button("Add", use_container_width=True):
+                st.session_state.custom_funds.append({"code": pick["code"], "name": pick["name"]})
+                st.rerun(scope="app")
+        elif query:
+            st.caption("No matching schemes.")
+
+        for fund in st.session_state.custom_funds:
+            f1, f2 = st.columns([5, 1])
+            f1.markdown(f"**{fund['name']}** (`{fund['code']}`)")
+            if f2.button("Remove", key=f"remove_{fund['code']}", use_container_width=True):
+                st.session_state.custom_funds.remove(fund)
+                st.session_state.pop(f"in_{fund['code']}", None)
+                st.rerun(scope="app")
+
+@st.fragment
+@timed("fragment_return_range")
+def return_range_section(schemes, tenure):
+    with st.expander("📊 Historical Return Range (Rolling CAGR)"):
+        st.caption("CAGR for every possible start date in each fund's NAV history, not just the latest window.")
+        window = st.select_slider("Holding Period (Years)", options=[1, 3, 5, 10],
+                                  value=1 if tenure < 5 else (3 if tenure < 10 else 5))
+        rows, stats = [], []
+        for cat, scheme in schemes:
+            rolling = fetch_rolling_returns(scheme, (window,))
+            if window not in rolling:
+                continue
+            cagr = rolling[window][1]
+            summary = return_distribution(cagr)
+            if summary is None:
+                continue
+            rows.append({"Fund": cat, "Windows": summary["windows"], "Worst": summary["worst"],
+                         "P10": summary["p10"], "Median": summary["p50"], "P90": summary["p90"],
+                         "Best": summary["best"], "Positive": summary["positive_share"] * 100})
+            stats.append(summary)
+        if rows:
+            import pandas as pd
+            import plotly.graph_objects as go
+
+            with timer("render_return_range"):
+                # Box statistics are computed here, so the chart carries 5 numbers per fund, not every window
+                fig_dist = go.Figure(go.Box(
+                    x=[r["Fund"] for r in rows], lowerfence=[x["worst"] for x in stats],
+                    q1=[x["p25"] for x in stats], median=[x["p50"] for x in stats],
+                    q3=[x["p75"] for x in stats], upperfence=[x["best"] for x in stats],
+                    marker_color="#ef4444", name="CAGR (%)"
+                ))
+                fig_dist.update_layout(height=350, margin=dict(t=10, b=10, l=0, r=0),
+                                       paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+                st.plotly_chart(fig_dist, use_container_width=True)
+            st.dataframe(pd.DataFrame(rows).set_index("Fund").style.format("{:.1f}%", subset=[
+                "Worst", "P10", "Median", "P90", "Best", "Positive"]), use_container_width=True)
+        else:
+            st.info(f"Not enough NAV history for {window}-year rolling returns.")
+
+@st.fragment
+@timed("fragment_monte_carlo")
+def monte_carlo_section(funds, base_sip, tenure, step_up, final_corpus):
+    with st.expander("🎲 Range of Outcomes (Historical Monte Carlo)"):
+        st.caption("Replays random 12-month blocks of real NAV history. All funds sample the same months, so their historical correlation is preserved.")
+        mc1, mc2 = st.columns(2)
+        n_paths = mc1.select_slider("Simulated Paths", options=[1000, 5000, 10000, 25000, 50000], value=10000)
+        goal = mc2.number_input("Goal Corpus (₹)", min_value=0, value=int(final_corpus), step=100000)
+        if st.button("Run Simulation", key="run_mc"):
+            active = [f for f in funds if f["allocation_pct"] > 0]
+            try:
+                with st.spinner("Simulating market paths..."):
+                    _, monthly_returns = load_monthly_returns([f["scheme"] for f in active])
+                    mc = run_monte_carlo(
+                        monthly_returns, [base_sip * f["allocation_pct"] / 100 for f in active],
+                        tenure, step_up, n_paths=n_paths
+                    )
+            except ValueError:
+                st.info("No shared NAV history for these funds. Try a different mix of funds.")
+            except Exception:
+                st.error("Could not load NAV history for the simulation. Please try again later.")
+            else:
+                band_df = mc.bands_frame()
+                final = band_df.iloc[-1]
+                b1, b2, b3, b4 = st.columns(4)
+                b1.metric("Pessimistic (P10)", format_currency(final["P10"]))
+                b2.metric("Median (P50)", format_currency(final["P50"]))
+                b3.metric("Optimistic (P90)", format_currency(final["P90"]))
+                b4.metric("Chance of Reaching Goal", f"{mc.probability_of_goal(goal):.0%}")
+                st.line_chart(band_df)
+
+@st.fragment
+@timed("fragment_backtest")
+def backtest_section(funds, base_sip, tenure, step_up):
+    with st.expander("⏪ Historical Backtest (Real NAV Dates)"):
+        st.caption(f"Replays this exact step-up SIP against real NAVs for every possible start date with {tenure} years of history after it. Each instalment buys units on its actual transaction date.")
+        if st.button("Run Backtest", key="run_backtest"):
+            active = [f for f in funds if f["allocation_pct"] > 0]
+            try:
+                with st.spinner("Replaying history..."):
+                    bt = backtest_categories(
+                        [f["scheme"] for f in active], [base_sip * f["allocation_pct"] / 100 for f in active],
+                        tenure, step_up
+                    ).combined
+            except Exception:
+                st.error("Could not load NAV history for the backtest. Please try again later.")
+            else:
+                if len(bt) == 0:
+                    st.info(f"The selected funds do not have {tenure} years of shared NAV history yet. Try a shorter tenure.")
+                else:
+                    x10, x50, x90 = bt.percentiles("xirr")
+                    c10, c50, c90 = bt.percentiles("corpus")
+                    k1, k2, k3, k4 = st.columns(4)
+                    k1.metric("Start Dates Tested", f"{len(bt):,}")
+                    k2.metric("Median XIRR", f"{x50:.1f}%", help=f"P10 {x10:.1f}% · P90 {x90:.1f}%")
+                    k3.metric("Median Corpus", format_currency(c50))
+                    k4.metric("Worst Corpus", format_currency(bt.corpus.min()))
+                    st.caption(f"Realized corpus range (P10–P90): {format_currency(c10)} – {format_currency(c90)} "
+                               f"on {format_currency(bt.total_invested)} invested.")
+                    import pandas as pd
+
+                    xirr_x, xirr_y = chart_series(bt.start_dates, {"XIRR (%)": bt.xirr})["XIRR (%)"]
+                    xirr_df = pd.DataFrame({"XIRR (%)": xirr_y},
+                                           index=pd.Index(to_datetime64(xirr_x), name="Start Date"))
+                    st.line_chart(xirr_df, color="#ef4444")
+
+@st.fragment
+@timed("fragment_goal_planner")
+def goal_planner_section(funds, base_sip, tenure, step_up):
+    st.subheader("Work Backwards From Your Goal")
+    g1, g2, g3 = st.columns([2, 2, 1])
+    with g1:
+        target = st.number_input("Target Corpus (₹)", min_value=100000, value=10000000, step=500000)
+    with g2:
+        solve_for = st.radio("Solve For", ["Monthly SIP", "Annual Step-up", "Tenure"], horizontal=True)
+    with g3:
+        st.write("Today's Money")
+        real_terms = st.toggle("Adjust for 6% Inflation", value=False, label_visibility="collapsed")
+    goal_inflation = 6.0 if real_terms else None
+
+    if solve_for == "Monthly SIP":
+        needed = required_sip(target, tenure, step_up, funds, inflation_pct=goal_inflation)
+        st.metric("Required Starting SIP", format_currency(needed), delta=format_currency(needed - base_sip))
+        st.caption(f"Over {tenure} years with a {step_up}% annual step-up.")
+    elif solve_for == "Annual Step-up":
+        needed = required_step_up(target, base_sip, tenure, funds, inflation_pct=goal_inflation)
+        if needed is None:
+            st.warning("This goal is out of reach with your current SIP and tenure, even with a 100% annual step-up.")
+        else:
+            st.metric("Required Annual Step-up", f"{needed:.1f}%")
+            st.caption(f"Starting from {format_currency(base_sip)}/month over {tenure} years.")
+    else:
+        needed = required_tenure(target, base_sip, step_up, funds, inflation_pct=goal_inflation)
+        if needed is None:
+            st.warning("This goal is not reached within 50 years at your current SIP and step-up.")
+        else:
+            st.metric("Years to Goal", f"{needed} years")
+            st.caption(f"Starting from {format_currency(base_sip)}/month with a {step_up}% annual step-up.")
+
+@st.fragment
+@timed("fragment_planner")
+def planner(base_sip, tenure, step_up, use_live_data, live_returns, custom_funds):
+    """
+    Allocation, projection and goal tabs. Editing an allocation reruns only
+    this fragment: market data is not refetched and the header is not redrawn.
+    """
+    tab1, tab2, tab3 = st.tabs(["📋 Strategy & Allocation", "📈 Projection Analysis", "🎯 Goal Planner"])
+
+    with tab1:
+        st.subheader("Select Risk Profile")
+        p1, p2, p3 = st.columns(3)
+        if p1.button("🛡️ Conservative", use_container_width=True, type="primary" if st.session_state.selected_profile == "Conservative" else "secondary"):
+            select_profile("Conservative", 60, 10, 20, 10, 0, 0); st.rerun(scope="fragment")
+        if p2.button("⚖️ Balanced", use_container_width=True, type="primary" if st.session_state.selected_profile == "Balanced" else "secondary"):
+            select_profile("Balanced", 30, 10, 30, 20, 5, 5); st.rerun(scope="fragment")
+        if p3.button("🚀 Aggressive", use_container_width=True, type="primary" if st.session_state.selected_profile == "Aggressive" else "secondary"):
+            select_profile("Aggressive", 10, 5, 25, 20, 20, 20); st.rerun(scope="fragment")
+
+        input_col, chart_col = st.columns([2, 1])
+        funds = []
+        total_alloc = 0
+
+        with input_col:
+            sc1, sc2 = st.columns(2)
+            for i, cat in enumerate(CATEGORIES):
+                col = sc1 if i < 3 else sc2
+                with col:
+                    alloc = st.number_input(f"{cat} (%)", 0, 100, st.session_state[cat], key=f"in_{cat}")
+                    if use_live_data:
+                        ret, period = live_returns[cat]
+                        st.caption(f"Adaptive Return: **{ret}%**")
+                        current_ret = ret
+                    else:
+                        current_ret = st.number_input(f"{cat} Est. Return (%)", 0.0, 40.0, 12.0, key=f"manual_{cat}")
+
+                    funds.append({"name": cat, "scheme": cat, "allocation_pct": alloc, "return_pct": current_ret})
+                    total_alloc += alloc
+
+            # User-picked schemes, any code from the scheme index
+            cc1, cc2 = st.columns(2)
+            for i, fund in enumerate(custom_funds):
+                code = fund["code"]
+                with cc1 if i % 2 == 0 else cc2:
+                    # Seeded through Session State only (profiles reset it), so no value= here
+                    st.session_state.setdefault(f"in_{code}", 0)
+                    alloc = st.number_input(f"{fund['name']} (%)", 0, 100, key=f"in_{code}")
+                    if use_live_data:
+                        ret, period = live_returns[code]
+                        st.caption(f"Adaptive Return: **{ret}%**")
+                        current_ret = ret
+                    else:
+                        current_ret = st.number_input(f"{fund['name']} Est. Return (%)", 0.0, 40.0, 12.0, key=f"manual_{code}")
+
+                    funds.append({"name": fund["name"], "scheme": code, "allocation_pct": alloc, "return_pct": current_ret})
+                    total_alloc += alloc
+
+        with chart_col:
+            if total_alloc > 0:
+                with timer("render_allocation_chart"):
+                    import pandas as pd
+                    import plotly.express as px
+
+                    df_pie = pd.DataFrame(funds)
+                    # Use a thinner donut with a clean, high-contrast palette
+                    fig = px.pie(df_pie, values='allocation_pct', names='name', hole=0.75,
+                                 color_discrete_sequence=px.colors.sequential.RdBu_r)
+
+                    fig.update_traces(
+                        textposition='outside',
+                        textinfo='percent',
+                        marker=dict(line=dict(color='#FFFFFF', width=2))
+                    )
+
+                    fig.update_layout(
+                        height=400,
+                        margin=dict(t=0, b=40, l=0, r=0),
+                        showlegend=True,
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=-0.3,
+                            xanchor="center",
+                            x=0.5
+                        ),
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        # Centered Annotation inside the hole
+                        annotations=[dict(text='Portfolio<br>Mix', x=0.5, y=0.5, font_size=16, showarrow=False, font_family="sans-serif")]
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                if total_alloc != 100:
+                    st.error(f"Total: {total_alloc}% (Must be 100%)")
+                else:
+                    st.success("Allocation Balanced")
+
+        fund_picker_section()
+
+        # --- HISTORICAL RETURN DISTRIBUTION ---
+        if use_live_data:
+            return_range_section([(f["name"], f["scheme"]) for f in funds], tenure)
+
+    with tab2:
+        if total_alloc == 100:
+            history, fund_details, total_invested = run_portfolio(base_sip, tenure, step_up, funds)
+            final_corpus = history[-1]
+
+            # Metrics Row
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Maturity Value", format_currency(final_corpus))
+            m2.metric("Total Invested", format_currency(total_invested))
+            m3.metric("Wealth Wealth Gain", format_currency(final_corpus - total_invested))
+            m4.metric("Growth Multiplier", f"{(final_corpus/total_invested):.2f}x")
+
+            # Visualizations
+            st.subheader("Growth Projection")
+            # Year-end points only (at most 50, maturity included); already within the chart budget
+            with timer("render_growth_chart"):
+                import pandas as pd
+
+                year_x, corpus_y = chart_series(np.arange(1, tenure + 1), {"Corpus": history[11::12]})["Corpus"]
+                chart_df = pd.DataFrame({
+                    "Year": year_x,
+                    "Corpus": corpus_y
+                }).set_index("Year")
+                st.area_chart(chart_df, color="#ef4444")
+
+            # Breakdown - Expanded by default
+            with st.expander("Detailed Asset Performance", expanded=True):
+                with timer("build_fund_table"):
+                    df_funds = fund_details.to_frame()
+                    df_funds["Allocation"] = [f"{f['allocation_pct']}%" for f in funds]
+                    df_funds["Return"] = [f"{f['return_pct']}%" for f in funds]
+                    df_funds["Final Value"] = format_currency_array(df_funds["final_value"].to_numpy())
+                st.dataframe(df_funds[["Allocation", "Return", "Final Value"]], use_container_width=True)
+
+            # Advisor Note
+            inflation_rate = 0.06
+            real_val = final_corpus / ((1 + inflation_rate) ** tenure)
+            st.info(f"💡 **Advisor Note:** Adjusted for 6% inflation, your corpus of {format_currency(final_corpus)} will have the purchasing power of **{format_currency(real_val)}** today.")
+
+            # --- MONTE CARLO RANGE ---
+            monte_carlo_section(funds, base_sip, tenure, step_up, final_corpus)
+
+            # --- HISTORICAL BACKTEST ---
+            backtest_section(funds, base_sip, tenure, step_up)
+        else:
+            st.warning("Adjust your allocation to 100% in the 'Strategy' tab to see projections.")
+
+    with tab3:
+        if total_alloc == 100:
+            goal_planner_section(funds, base_sip, tenure, step_up)
+        else:
+            st.warning("Adjust your allocation to 100% in the 'Strategy' tab to plan for a goal.")
 
 # --- MAIN CONTENT ---
 st.title("📈 ArthaFlow: Strategic SIP Planner")
 
 # --- SECTION 1: CORE PARAMETERS (MAIN SPACE) ---
+# Everything below depends on these, so changing one reruns the whole page
 st.subheader("1. Investment Parameters")
 with st.container():
     c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
@@ -138,107 +503,19 @@ with st.container():
 
 st.divider()
 
+# --- MARKET DATA ---
+# Fetch every category in one concurrent batch instead of one request per input box.
+# Only the tenure and the live toggle change the answer, so fragments reuse it.
+custom_funds = list(st.session_state.custom_funds)
+fund_names = {f["code"]: f["name"] for f in custom_funds}
+live_returns = fetch_real_returns(CATEGORIES + list(fund_names), tenure) if use_live_data else {}
+degraded = {cat: kind for cat, kind in degraded_categories().items() if cat in live_returns} if use_live_data else {}
+if degraded:
+    st.warning("⚠️ MFAPI.in is slow or unreachable. Showing last known returns for: "
+               + ", ".join(f"{fund_names.get(cat, cat)} ({'cached' if kind == 'stale' else 'estimate'})" for cat, kind in degraded.items()))
+
 # --- SECTION 2: ALLOCATION & PROJECTION ---
-tab1, tab2 = st.tabs(["📋 Strategy & Allocation", "📈 Projection Analysis"])
-
-with tab1:
-    st.subheader("Select Risk Profile")
-    p1, p2, p3 = st.columns(3)
-    if p1.button("🛡️ Conservative", use_container_width=True, type="primary" if st.session_state.selected_profile == "Conservative" else "secondary"):
-        select_profile("Conservative", 60, 10, 20, 10, 0, 0); st.rerun()
-    if p2.button("⚖️ Balanced", use_container_width=True, type="primary" if st.session_state.selected_profile == "Balanced" else "secondary"):
-        select_profile("Balanced", 30, 10, 30, 20, 5, 5); st.rerun()
-    if p3.button("🚀 Aggressive", use_container_width=True, type="primary" if st.session_state.selected_profile == "Aggressive" else "secondary"):
-        select_profile("Aggressive", 10, 5, 25, 20, 20, 20); st.rerun()
-
-    input_col, chart_col = st.columns([2, 1])
-    categories = ["Debt MF", "Gold ETF", "Nifty 50", "Flexi Cap", "Mid Cap", "Small Cap"]
-    funds = []
-    total_alloc = 0
-
-    with input_col:
-        sc1, sc2 = st.columns(2)
-        for i, cat in enumerate(categories):
-            col = sc1 if i < 3 else sc2
-            with col:
-                alloc = st.number_input(f"{cat} (%)", 0, 100, st.session_state[cat], key=f"in_{cat}")
-                if use_live_data:
-                    ret, period = fetch_real_return(cat, tenure)
-                    st.caption(f"Adaptive Return: **{ret}%**")
-                    current_ret = ret
-                else:
-                    current_ret = st.number_input(f"{cat} Est. Return (%)", 0.0, 40.0, 12.0, key=f"manual_{cat}")
-                
-                funds.append({"name": cat, "allocation_pct": alloc, "return_pct": current_ret})
-                total_alloc += alloc
-
-    with chart_col:
-        if total_alloc > 0:
-            df_pie = pd.DataFrame(funds)
-            # Use a thinner donut with a clean, high-contrast palette
-            fig = px.pie(df_pie, values='allocation_pct', names='name', hole=0.75,
-                         color_discrete_sequence=px.colors.sequential.RdBu_r)
-            
-            fig.update_traces(
-                textposition='outside', 
-                textinfo='percent',
-                marker=dict(line=dict(color='#FFFFFF', width=2))
-            )
-            
-            fig.update_layout(
-                height=400, 
-                margin=dict(t=0, b=40, l=0, r=0), 
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=-0.3,
-                    xanchor="center",
-                    x=0.5
-                ),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                # Centered Annotation inside the hole
-                annotations=[dict(text='Portfolio<br>Mix', x=0.5, y=0.5, font_size=16, showarrow=False, font_family="sans-serif")]
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            if total_alloc != 100:
-                st.error(f"Total: {total_alloc}% (Must be 100%)")
-            else:
-                st.success("Allocation Balanced")
-
-with tab2:
-    if total_alloc == 100:
-        history, fund_details, total_invested = simulate_portfolio(base_sip, tenure, step_up, funds)
-        final_corpus = history[-1]
-        
-        # Metrics Row
-        m1, m2, m3, m4 = st.columns(4)
-        m1.metric("Maturity Value", format_currency(final_corpus))
-        m2.metric("Total Invested", format_currency(total_invested))
-        m3.metric("Wealth Wealth Gain", format_currency(final_corpus - total_invested))
-        m4.metric("Growth Multiplier", f"{(final_corpus/total_invested):.2f}x")
-
-        # Visualizations
-        st.subheader("Growth Projection")
-        yearly_data = history[11::12]
-        chart_df = pd.DataFrame({
-            "Year": range(1, tenure + 1), 
-            "Corpus": yearly_data
-        }).set_index("Year")
-        st.area_chart(chart_df, color="#ef4444")
-
-        # Breakdown - Expanded by default
-        with st.expander("Detailed Asset Performance", expanded=True):
-            df_funds = pd.DataFrame(fund_details)
-            df_funds["Allocation"] = [f"{f['allocation_pct']}%" for f in funds]
-            df_funds["Return"] = [f"{f['return_pct']}%" for f in funds]
-            df_funds["Final Value"] = df_funds["final_value"].apply(format_currency)
-            st.dataframe(df_funds[["name", "Allocation", "Return", "Final Value"]], use_container_width=True)
-            
-        # Advisor Note
-        inflation_rate = 0.06
-        real_val = final_corpus / ((1 + inflation_rate) ** tenure)
-        st.info(f"💡 **Advisor Note:** Adjusted for 6% inflation, your corpus of {format_currency(final_corpus)} will have the purchasing power of **{format_currency(real_val)}** today.")
-    else:
-        st.warning("Adjust your allocation to 100% in the 'Strategy' tab to see projections.")
\ No newline at end of file
+planner(base_sip, tenure, step_up, use_live_data, live_returns, custom_funds)
+
+rerun_timer.stop()
+mark_startup("sip_planner", "first_paint")
@@ -0,0 +1,153 @@
+"""
+Reference implementations the vectorized engines are checked against: the
+original month-by-month loops (as they were before the NumPy rewrites) and
+straightforward scalar versions of the numerical routines.
+"""
+import json
+import math
+from datetime import date, timedelta
+
+
+def calculate_fund_growth(initial_sip, years, step_up_pct, annual_return_pct):
+    # Original sip_engine loop
+    monthly_rate = (1 + (annual_return_pct / 100)) ** (1 / 12) - 1
+    step_up_factor = 1 + (step_up_pct / 100)
+
+    corpus = 0.0
+    total_invested = 0.0
+    monthly_history = []
+
+    for month in range(1, (years * 12) + 1):
+        year_index = (month - 1) // 12
+        current_sip = initial_sip * (step_up_factor ** year_index)
+        corpus = (corpus + current_sip) * (1 + monthly_rate)
+        total_invested += current_sip
+        monthly_history.append(corpus)
+
+    return monthly_history, total_invested
+
+
+def simulate_portfolio(total_sip, years, step_up_pct, funds_config):
+    # Original portfolio loop
+    combined_history = None
+    fund_results = []
+    total_portfolio_invested = 0.0
+
+    for fund in funds_config:
+        fund_sip = total_sip * (fund['allocation_pct'] / 100)
+        history, invested = calculate_fund_growth(fund_sip, years, step_up_pct, fund['return_pct'])
+        total_portfolio_invested += invested
+        fund_results.append({"name": fund['name'], "final_value": history[-1], "total_invested": invested})
+        if combined_history is None:
+            combined_history = [0.0] * len(history)
+        for i in range(len(history)):
+            combined_history[i] += history[i]
+
+    return combined_history, fund_results, total_portfolio_invested
+
+
+def stepup_loan(loan_bal, rate, emi, initial_cont, step_up_pct, split_ratio, sip_return, months=240):
+    # Original get_stepup_data loop from pages/Loan_Analyzer.py
+    loan, sip, cont = [], [], []
+    curr_loan, curr_sip = loan_bal, 0
+    current_monthly_cont = initial_cont
+    intersect_m = None
+
+    for m in range(1, months + 1):
+        if m > 1 and (m - 1) % 12 == 0:
+            current_monthly_cont *= (1 + (step_up_pct / 100))
+
+        m_prepay = (current_monthly_cont * split_ratio) / 100
+        m_sip = current_monthly_cont - m_prepay
+
+        interest = curr_loan * (rate / 100 / 12)
+        principal = (emi - interest) + m_prepay
+        curr_loan = max(0, curr_loan - principal)
+
+        curr_sip = (curr_sip + m_sip) * (1 + (sip_return / 100 / 12))
+
+        loan.append(curr_loan)
+        sip.append(curr_sip)
+        cont.append(current_monthly_cont)
+
+        if curr_sip >= curr_loan and intersect_m is None and curr_loan > 0:
+            intersect_m = m
+
+    return loan, sip, cont, intersect_m
+
+
+def xirr(outflows, years_held, terminal_value, tol=1e-13):
+    """
+    Scalar XIRR (percent) by bisection on the rate.
+    """
+    def residual(r):
+        return sum(a * (1 + r) ** t for a, t in zip(outflows, years_held)) - terminal_value
+
+    lo, hi = -0.99, 10.0
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if residual(mid) > 0:
+            hi = mid
+        else:
+            lo = mid
+    return (lo + hi) / 2 * 100
+
+
+def lttb(x, y, n_out):
+    """
+    Textbook Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+    """
+    n = len(x)
+    if n_out >= n:
+        return list(range(n))
+    every = (n - 2) / (n_out - 2)
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def payload(n_days=400, start=date(2015, 1, 1), bad_every=0):
+    """
+    mfapi.in-shaped payload bytes (newest row first). With `bad_every`, every
+    n-th row has a non-numeric NAV, as mfapi.in occasionally serves.
+    """
+    rows, nav = [], 10.0
+    for k in range(n_days):
+        day = start + timedelta(days=k)
+        nav *= 1.0003 + 0.004 * math.sin(k)
+        value = "N.A." if bad_every and k % bad_every == 0 else f"{nav:.5f}"
+        rows.append({"date": day.strftime("%d-%m-%Y"), "nav": value})
+    rows.reverse()
+    return json.dumps({"meta": {"scheme_code": 1}, "data": rows, "status": "SUCCESS"}).encode()
+
+
+def parse_with_json(raw):
+    """
+    (ordinals, navs) oldest first, decoded row by row with the json module.
+    """
+    dates, navs = [], []
+    for row in reversed(json.loads(raw)["data"]):
+        try:
+            nav = float(row["nav"])
+        except ValueError:
+            continue
+        d, m, y = (int(part) for part in row["date"].split("-"))
+        dates.append(date(y, m, d).toordinal())
+        navs.append(nav)
+    return dates, navs
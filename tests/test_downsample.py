@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import reference
+from SIP.finance.downsample import chart_series, downsample, lttb
+
+
+@pytest.mark.parametrize("n,n_out", [(240, 80), (600, 50), (1000, 160), (5000, 3), (97, 96)])
+def test_lttb_matches_textbook_algorithm(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    assert lttb(x, y, n_out).tolist() == reference.lttb(x.tolist(), y.tolist(), n_out)
+
+
+def test_short_series_are_untouched():
+    x = np.arange(50.0)
+    np.testing.assert_array_equal(downsample(x, x ** 2, max_points=160), np.arange(50))
+
+
+def test_downsample_keeps_key_points_within_budget():
+    x = np.arange(240.0)
+    y = np.maximum(2e6 - 1e4 * x, 0.0)
+    keep = [0, 113, 151, 239]
+    index = downsample(x, y, max_points=80, keep=keep)
+    assert len(index) <= 80
+    assert set(keep) <= set(index.tolist())
+    assert np.all(np.diff(index) > 0)
+
+
+def test_chart_series_splits_budget_between_series():
+    x = np.arange(240)
+    lines = chart_series(x, {"Loan": x[::-1] * 1.0, "SIP": x ** 1.5}, max_points=160, keep=[100])
+    assert all(len(px) <= 80 and 100 in px for px, _ in lines.values())
@@ -0,0 +1,38 @@
+import pytest
+
+import reference
+from SIP.finance.goal_seek import required_sip, required_step_up, required_tenure
+
+FUNDS = [
+    {"name": "Nifty 50", "allocation_pct": 60, "return_pct": 12.5},
+    {"name": "Debt MF", "allocation_pct": 40, "return_pct": 7.0},
+]
+
+
+def _final(sip, years, step_up):
+    return reference.simulate_portfolio(sip, years, step_up, FUNDS)[0][-1]
+
+
+@pytest.mark.parametrize("years,step_up", [(5, 0), (15, 10), (30, 5)])
+def test_required_sip_reaches_target(years, step_up):
+    sip = required_sip(10_000_000, years, step_up, FUNDS)
+    assert _final(sip, years, step_up) == pytest.approx(10_000_000, rel=1e-11)
+
+
+def test_required_sip_in_todays_money():
+    sip = required_sip(10_000_000, 20, 10, FUNDS, inflation_pct=6.0)
+    assert _final(sip, 20, 10) / 1.06 ** 20 == pytest.approx(10_000_000, rel=1e-11)
+
+
+def test_required_step_up_reaches_target():
+    step_up = required_step_up(20_000_000, 15000, 20, FUNDS)
+    assert 0 < step_up < 100
+    assert _final(15000, 20, step_up) == pytest.approx(20_000_000, rel=1e-9)
+    assert required_step_up(1_000, 15000, 20, FUNDS) == 0.0
+    assert required_step_up(1e15, 15000, 5, FUNDS) is None
+
+
+@pytest.mark.parametrize("target,step_up", [(5_000_000, 10), (25_000_000, 0), (1e13, 10)])
+def test_required_tenure_is_first_year_reaching_target(target, step_up):
+    expected = next((years for years in range(1, 51) if _final(20000, years, step_up) >= target), None)
+    assert required_tenure(target, 20000, step_up, FUNDS) == expected
@@ -0,0 +1,59 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import reference
+from SIP.finance.loan_engine import simulate_stepup_loan, simulate_stepup_loan_cached, sweep_stepup
+
+# (balance, rate, EMI, contribution, step-up, split, SIP return): the page defaults and a few extremes
+SCENARIOS = [
+    (2225354, 8.1, 21047, 10000, 10, 50, 12.0),
+    (2225354, 8.1, 21047, 10000, 0, 0, 12.0),
+    (2225354, 8.1, 21047, 10000, 20, 100, 8.0),
+    (5000000, 9.5, 45000, 25000, 15, 60, 15.0),
+    (800000, 12.0, 9000, 2000, 5, 20, 18.0),
+    (3000000, 7.0, 25000, 0, 10, 50, 10.0),
+]
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_matches_monthly_loop(scenario):
+    loan, sip, cont, intersect = reference.stepup_loan(*scenario)
+    result = simulate_stepup_loan(*scenario)
+
+    np.testing.assert_allclose(result.loan, loan, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(result.sip, sip, rtol=1e-11, atol=1e-9)
+    np.testing.assert_allclose(result.monthly_cont, cont, rtol=1e-12)
+    assert result.intersect_month == intersect
+    paid_off = [m for m, balance in enumerate(loan, 1) if balance == 0]
+    assert result.payoff_month == (paid_off[0] if paid_off else None)
+
+
+def test_until_payoff_trims_at_payoff():
+    full = simulate_stepup_loan(*SCENARIOS[0])
+    trimmed = simulate_stepup_loan(*SCENARIOS[0], until_payoff=True)
+    assert trimmed.buffer.shape == (3, full.payoff_month)
+    np.testing.assert_array_equal(trimmed.buffer, full.buffer[:, :full.payoff_month])
+    assert trimmed.intersect_month == full.intersect_month
+
+
+def test_sweep_matches_single_scenarios():
+    splits, steps, rates, returns = [0, 40, 100], [0, 7, 20], [7.5, 9.0], [10.0, 14.0]
+    sweep = sweep_stepup(2225354, 21047, 10000, splits, steps, rates, returns)
+    assert sweep.freedom_month.shape == (3, 3, 2, 2)
+    for (i, split), (j, step), (k, rate), (m, ret) in itertools.product(
+            enumerate(splits), enumerate(steps), enumerate(rates), enumerate(returns)):
+        loan, sip, _, intersect = reference.stepup_loan(2225354, rate, 21047, 10000, step, split, ret)
+        assert sweep.freedom_month[i, j, k, m] == (intersect or 0)
+        assert sweep.final_net_worth[i, j, k, m] == pytest.approx(sip[-1] - loan[-1], rel=1e-9, abs=1e-6)
+
+
+def test_cached_result_is_read_only():
+    result = simulate_stepup_loan_cached(*SCENARIOS[0])
+    frame = result.to_frame()
+    with pytest.raises(ValueError):
+        frame.loc[1, "Loan"] = 0.0
+    with pytest.raises(ValueError):
+        result.loan[0] = 0.0
+    assert simulate_stepup_loan_cached(*SCENARIOS[0]).loan[0] == reference.stepup_loan(*SCENARIOS[0])[0][0]
@@ -0,0 +1,44 @@
+import pytest
+
+import reference
+from SIP.finance.mfapi_stream import parse_payload, read_rows
+
+
+class _Response:
+    def __init__(self, raw):
+        self.raw = raw
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.raw), chunk_size):
+            yield self.raw[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("bad_every", [0, 7])
+@pytest.mark.parametrize("window", [97, 4096, 64 * 1024])
+def test_parse_payload_matches_json(bad_every, window):
+    raw = reference.payload(bad_every=bad_every)
+    dates, navs = parse_payload(raw, window=window)
+    expected_dates, expected_navs = reference.parse_with_json(raw)
+    assert list(dates) == expected_dates
+    assert list(navs) == expected_navs
+
+
+def test_parse_payload_falls_back_to_json_for_other_layouts():
+    raw = reference.payload().replace(b'"nav": ', b'"nav":  ').replace(b'", "nav"', b'", "extra": 1, "nav"')
+    assert [list(a) for a in parse_payload(raw)] == [list(a) for a in reference.parse_with_json(raw)]
+
+
+@pytest.mark.parametrize("chunk_size", [13, 1000])
+def test_read_rows_streams_rows_after_a_date(chunk_size):
+    raw = reference.payload(bad_every=11)
+    expected_dates, expected_navs = reference.parse_with_json(raw)
+    after = expected_dates[300]
+    response = _Response(raw)
+    dates, navs = read_rows(response, after=after, chunk_size=chunk_size)
+    assert list(dates) == expected_dates[301:]
+    assert list(navs) == expected_navs[301:]
+    assert response.closed
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import reference
+from SIP.finance.portfolio import IncrementalPortfolio, simulate_portfolio, simulate_portfolio_batch
+
+FUNDS = [
+    {"name": "Debt MF", "allocation_pct": 30, "return_pct": 7.0},
+    {"name": "Gold ETF", "allocation_pct": 10, "return_pct": 9.5},
+    {"name": "Nifty 50", "allocation_pct": 30, "return_pct": 12.5},
+    {"name": "Flexi Cap", "allocation_pct": 20, "return_pct": 14.5},
+    {"name": "Mid Cap", "allocation_pct": 5, "return_pct": 17.0},
+    {"name": "Small Cap", "allocation_pct": 5, "return_pct": 19.0},
+]
+
+
+@pytest.mark.parametrize("years,step_up", [(1, 0), (15, 10), (50, 7.5)])
+def test_simulate_portfolio_matches_loop(years, step_up):
+    expected, expected_funds, expected_invested = reference.simulate_portfolio(25000, years, step_up, FUNDS)
+    history, summary, invested = simulate_portfolio(25000, years, step_up, FUNDS)
+
+    np.testing.assert_allclose(history, expected, rtol=1e-11)
+    assert invested == pytest.approx(expected_invested, rel=1e-12)
+    assert list(summary.names) == [f["name"] for f in expected_funds]
+    np.testing.assert_allclose(summary.final_values, [f["final_value"] for f in expected_funds], rtol=1e-11)
+    np.testing.assert_allclose(summary.total_invested, [f["total_invested"] for f in expected_funds], rtol=1e-12)
+
+
+def test_empty_portfolio():
+    history, summary, invested = simulate_portfolio(25000, 10, 10, [])
+    assert history is None and len(summary) == 0 and invested == 0.0
+    with pytest.raises(ValueError):
+        simulate_portfolio_batch(25000, 10, 10, [], [])
+
+
+def test_batch_matches_single_portfolios():
+    rng = np.random.default_rng(0)
+    allocations = rng.dirichlet(np.ones(len(FUNDS)), 50) * 100
+    returns = [f["return_pct"] for f in FUNDS]
+    result = simulate_portfolio_batch(25000, 20, 10, allocations, returns)
+    combined_only = simulate_portfolio_batch(25000, 20, 10, allocations, returns, per_fund=False)
+
+    for i in (0, 17, 49):
+        mix = [dict(f, allocation_pct=a) for f, a in zip(FUNDS, allocations[i])]
+        expected, _, invested = reference.simulate_portfolio(25000, 20, 10, mix)
+        np.testing.assert_allclose(result.combined[i], expected, rtol=1e-11)
+        np.testing.assert_allclose(combined_only.combined[i], expected, rtol=1e-11)
+        np.testing.assert_allclose(result.yearly[i], expected[11::12], rtol=1e-11)
+        assert result.total_invested[i] == pytest.approx(invested, rel=1e-12)
+
+
+def test_incremental_updates_match_full_simulation():
+    engine = IncrementalPortfolio(25000, 25, 10, FUNDS)
+    rng = np.random.default_rng(1)
+    funds = [dict(f) for f in FUNDS]
+    for _ in range(300):  # crosses REBUILD_EVERY
+        i = int(rng.integers(len(funds)))
+        funds[i]["allocation_pct"] = int(rng.integers(0, 60))
+        funds[i]["return_pct"] = float(rng.choice([7.0, 12.5, 19.0]))
+        engine.sync(funds)
+
+    expected, expected_funds, invested = reference.simulate_portfolio(25000, 25, 10, funds)
+    np.testing.assert_allclose(engine.combined, expected, rtol=1e-9)
+    assert engine.total_invested == pytest.approx(invested, rel=1e-12)
+    np.testing.assert_allclose(engine.fund_results().final_values,
+                               [f["final_value"] for f in expected_funds], rtol=1e-11)
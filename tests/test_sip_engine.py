@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import reference
+from SIP.finance.sip_engine import calculate_fund_growth, fund_growth_curve, fund_terminal_value
+
+CASES = [(years, step, ret) for years in (1, 5, 25, 50) for step in (0, 10, 25) for ret in (0.0, 7.0, 12.5, 30.0)]
+
+
+@pytest.mark.parametrize("years,step_up,annual_return", CASES)
+def test_curve_matches_monthly_loop(years, step_up, annual_return):
+    expected, invested = reference.calculate_fund_growth(15000, years, step_up, annual_return)
+    curve = fund_growth_curve(15000, years, step_up, annual_return)
+    np.testing.assert_allclose(curve, expected, rtol=1e-11)
+
+    history, total = calculate_fund_growth(15000, years, step_up, annual_return)
+    assert isinstance(history, list)
+    np.testing.assert_allclose(history, expected, rtol=1e-11)
+    assert total == pytest.approx(invested, rel=1e-12)
+
+
+@pytest.mark.parametrize("years,step_up,annual_return", CASES)
+def test_terminal_value_matches_monthly_loop(years, step_up, annual_return):
+    expected, invested = reference.calculate_fund_growth(15000, years, step_up, annual_return)
+    # Scalar fast path and array path
+    for args in ((15000, years, step_up, annual_return), (np.float64(15000), years, step_up, annual_return)):
+        corpus, total = fund_terminal_value(*args)
+        assert float(corpus) == pytest.approx(expected[-1], rel=1e-11)
+        assert float(total) == pytest.approx(invested, rel=1e-12)
+
+
+def test_batch_rows_match_single_funds():
+    returns = np.array([0.0, 6.0, 12.0, 18.0])
+    sips = np.array([1000.0, 2500.0, 5000.0, 7500.0])
+    batch = fund_growth_curve(sips, 20, 10, returns)
+    assert batch.shape == (4, 240)
+    for row, sip, ret in zip(batch, sips, returns):
+        np.testing.assert_allclose(row, reference.calculate_fund_growth(sip, 20, 10, ret)[0], rtol=1e-11)
+
+    corpus, invested = fund_terminal_value(sips, np.array([5, 10, 20, 30]), 10, returns)
+    for c, i, sip, years, ret in zip(corpus, invested, sips, (5, 10, 20, 30), returns):
+        history, total = reference.calculate_fund_growth(sip, years, 10, ret)
+        assert c == pytest.approx(history[-1], rel=1e-11)
+        assert i == pytest.approx(total, rel=1e-12)
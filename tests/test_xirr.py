@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+import reference
+from SIP.finance.backtest import solve_xirr
+
+
+def test_single_flow_is_plain_growth():
+    assert solve_xirr([100.0], [1.0], 110.0) == pytest.approx(10.0, abs=1e-10)
+    assert solve_xirr([100.0], [2.0], 81.0) == pytest.approx(-10.0, abs=1e-10)
+
+
+def test_matches_scalar_solver_for_monthly_sips():
+    rng = np.random.default_rng(3)
+    months = 120
+    years_held = (months - np.arange(months)) / 12
+    outflows = 10000 * 1.1 ** (np.arange(months) // 12)
+    terminal = outflows.sum() * rng.uniform(0.7, 3.0, size=8)
+
+    got = solve_xirr(outflows, years_held, terminal)
+    assert got.shape == (8,)
+    for value, rate in zip(terminal, got):
+        assert rate == pytest.approx(reference.xirr(outflows, years_held, value), abs=1e-8)
+
+
+def test_rows_without_solution_are_nan():
+    got = solve_xirr([[100.0, 100.0], [100.0, 100.0]], [[1.0, 0.5], [1.0, 0.5]], np.array([0.0, 250.0]))
+    assert np.isnan(got[0]) and np.isfinite(got[1])